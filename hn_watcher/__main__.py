@@ -3,19 +3,18 @@
 Command-line interface for HN Watcher.
 """
 
-import fire  # type: ignore
-
 from hn_watcher.context import HNContextProvider
 from hn_watcher.workflow import NewCommentPublisher
 
 
-def watch_comments(post_id: int, config_path: str = "") -> None:
+def watch_comments(post_id: int, config_path: str = "", follow: bool = False) -> None:
     """
     Watch for new comments on a Hacker News post and publish them to RabbitMQ.
 
     Args:
         post_id: The ID of the Hacker News post
         config_path: Path to the TOML configuration file
+        follow: Keep running and publish comments as they are posted
     """
     # Create a context using the provider
     context = HNContextProvider.get_default_context(config_path)
@@ -24,16 +23,29 @@ def watch_comments(post_id: int, config_path: str = "") -> None:
     watcher = NewCommentPublisher(context)
 
     try:
-        # Run once and exit
-        comments = watcher.publish_new_comments(post_id)
-        print(f"Found {len(comments)} new comments")
-
-        for comment in comments:
-            print(f"  - [{comment.id}] {comment.by}: {(comment.text or '')[:50]}...")
+        if follow:
+            # Stream updates until interrupted
+            batches = watcher.follow_new_comments(post_id)
+        else:
+            # Run once and exit
+            batches = iter([watcher.publish_new_comments(post_id)])
+
+        for comments in batches:
+            print(f"Found {len(comments)} new comments")
+
+            for comment in comments:
+                print(
+                    f"  - [{comment.id}] {comment.by}: {(comment.text or '')[:50]}..."
+                )
+    except KeyboardInterrupt:
+        pass
     finally:
         # Clean up resources
         context.close()
 
 
 if __name__ == "__main__":
+    # Imported here so importing this module stays cheap
+    import fire  # type: ignore
+
     fire.Fire(watch_comments)
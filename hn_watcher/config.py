@@ -1,10 +1,17 @@
+import copy
+import functools
 import os
+import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-import toml
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
 
 
+@functools.cache
 def find_config_file() -> str:
     """
     Find the configuration file in standard locations.
@@ -14,6 +21,8 @@ def find_config_file() -> str:
     2. ~/.config/hn_watcher/config.toml (user config directory)
     3. /etc/hn_watcher/config.toml (system config directory)
 
+    The result is cached for the lifetime of the process.
+
     Returns:
         Path to the first config file found, or None if no config file exists
     """
@@ -39,6 +48,8 @@ def load_config(config_path: str = "") -> Dict[str, Any]:
     """
     Load configuration from a TOML file.
 
+    Parsed files are cached and reused until their modification time changes.
+
     Args:
         config_path: Path to the configuration file. If not provided,
                     the function will search for a config file in standard locations.
@@ -49,6 +60,29 @@ def load_config(config_path: str = "") -> Dict[str, Any]:
     if not config_path:
         config_path = find_config_file()
 
+    try:
+        mtime_ns: Optional[int] = (
+            os.stat(config_path).st_mtime_ns if config_path else None
+        )
+    except OSError:
+        mtime_ns = None
+
+    # Copy so callers can't modify the cached configuration
+    return copy.deepcopy(_load_config(config_path, mtime_ns))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config(config_path: str, mtime_ns: Optional[int]) -> Dict[str, Any]:
+    """
+    Load and merge configuration for a file at a given modification time.
+
+    Args:
+        config_path: Path to the configuration file
+        mtime_ns: Modification time of the file, or None if it doesn't exist
+
+    Returns:
+        Dictionary with configuration values
+    """
     # Default configuration
     default_config = {
         "database": {"path": "hn_comments.db"},
@@ -57,17 +91,22 @@ def load_config(config_path: str = "") -> Dict[str, Any]:
             "exchange": "hackernews",
             "exchange_type": "topic",
             "durable": True,
+            "confirm_delivery": False,
+            "transient": False,
         },
         "api": {
-            "request_delay": 0.1,
+            "rate_limit": 20.0,
             "base_url": "https://hacker-news.firebaseio.com/v0",
+            "max_concurrency": 10,
+            "algolia_url": "https://hn.algolia.com/api/v1",
         },
     }
 
     # If config file exists, load it and merge with defaults
-    if config_path and os.path.exists(config_path):
+    if mtime_ns is not None:
         try:
-            user_config = toml.load(config_path)
+            with open(config_path, "rb") as f:
+                user_config = tomllib.load(f)
 
             # Merge with defaults (simple implementation)
             for section in default_config:
@@ -77,3 +116,9 @@ def load_config(config_path: str = "") -> Dict[str, Any]:
             print(f"Error loading config file {config_path}: {e}")
 
     return default_config
+
+
+def clear_config_cache() -> None:
+    """Forget cached config file locations and parsed configuration."""
+    find_config_file.cache_clear()
+    _load_config.cache_clear()
@@ -1,9 +1,11 @@
-from pika.exchange_type import ExchangeType
+from typing import TYPE_CHECKING, Union
 
 from hn_watcher.config import load_config
 from hn_watcher.db import CommentDatabase
-from hn_watcher.hn import HNContext, RequestsClient
-from hn_watcher.publisher import PikaPublisher
+from hn_watcher.hn import AlgoliaHNClient, HNContext, RequestsClient
+
+if TYPE_CHECKING:
+    from pika.exchange_type import ExchangeType
 
 
 class HNContextProvider:
@@ -24,6 +26,9 @@ class HNContextProvider:
         Returns:
             A configured HNContext
         """
+        # Imported here so that pika and avro are only loaded when publishing
+        from hn_watcher.publisher import PikaPublisher
+
         # Load configuration
         config = load_config(config_path)
 
@@ -35,12 +40,19 @@ class HNContextProvider:
         rabbitmq_durable = config["rabbitmq"]["durable"]
         rabbitmq_username = config["rabbitmq"]["username"]
         rabbitmq_password = config["rabbitmq"]["password"]
-        request_delay = config["api"]["request_delay"]
+        rabbitmq_confirm_delivery = config["rabbitmq"]["confirm_delivery"]
+        rabbitmq_transient = config["rabbitmq"]["transient"]
+        rate_limit = config["api"]["rate_limit"]
         base_url = config["api"]["base_url"]
+        max_concurrency = config["api"]["max_concurrency"]
+        algolia_url = config["api"]["algolia_url"]
 
         # Create components
         db = CommentDatabase(db_path)
-        api_client = RequestsClient()
+        api_client = RequestsClient(pool_maxsize=max_concurrency)
+        search_client = (
+            AlgoliaHNClient(api_client, algolia_url) if algolia_url else None
+        )
         publisher = PikaPublisher(
             host=rabbitmq_host,
             exchange=rabbitmq_exchange,
@@ -48,14 +60,18 @@ class HNContextProvider:
             durable=rabbitmq_durable,
             username=rabbitmq_username,
             password=rabbitmq_password,
+            confirm_delivery=rabbitmq_confirm_delivery,
+            transient=rabbitmq_transient,
         )
 
         return HNContext(
             api_client=api_client,
             db=db,
             publisher=publisher,
-            request_delay=request_delay,
+            rate_limit=rate_limit,
             base_url=base_url,
+            max_concurrency=max_concurrency,
+            search_client=search_client,
         )
 
     @staticmethod
@@ -63,10 +79,14 @@ class HNContextProvider:
         db_path: str = "hn_comments.db",
         rabbitmq_host: str = "localhost",
         rabbitmq_exchange: str = "hackernews",
-        rabbitmq_exchange_type: ExchangeType = ExchangeType.topic,
+        rabbitmq_exchange_type: Union[str, "ExchangeType"] = "topic",
         rabbitmq_durable: bool = True,
-        request_delay: float = 0.1,
+        rabbitmq_confirm_delivery: bool = False,
+        rabbitmq_transient: bool = False,
+        rate_limit: float = 20.0,
         base_url: str = "https://hacker-news.firebaseio.com/v0",
+        max_concurrency: int = 10,
+        algolia_url: str = "https://hn.algolia.com/api/v1",
     ) -> HNContext:
         """
         Alternative factory method that creates a context using parameter values directly.
@@ -79,25 +99,38 @@ class HNContextProvider:
             rabbitmq_exchange: RabbitMQ exchange name
             rabbitmq_exchange_type: RabbitMQ exchange type
             rabbitmq_durable: Whether the RabbitMQ exchange should be durable
-            request_delay: Delay between API requests
+            rabbitmq_confirm_delivery: Whether to wait for broker confirms on each publish
+            rabbitmq_transient: Whether to publish non-persistent messages
+            rate_limit: Maximum average number of API requests per second
             base_url: Base URL for the Hacker News API
+            max_concurrency: Maximum number of item requests in flight at once
+            algolia_url: Base URL for the Algolia search API, or empty to disable it
 
         Returns:
             A configured HNContext
         """
+        from hn_watcher.publisher import PikaPublisher
+
         db = CommentDatabase(db_path)
-        api_client = RequestsClient()
+        api_client = RequestsClient(pool_maxsize=max_concurrency)
+        search_client = (
+            AlgoliaHNClient(api_client, algolia_url) if algolia_url else None
+        )
         publisher = PikaPublisher(
             host=rabbitmq_host,
             exchange=rabbitmq_exchange,
             exchange_type=rabbitmq_exchange_type,
             durable=rabbitmq_durable,
+            confirm_delivery=rabbitmq_confirm_delivery,
+            transient=rabbitmq_transient,
         )
 
         return HNContext(
             api_client=api_client,
             db=db,
             publisher=publisher,
-            request_delay=request_delay,
+            rate_limit=rate_limit,
             base_url=base_url,
+            max_concurrency=max_concurrency,
+            search_client=search_client,
         )
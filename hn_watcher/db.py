@@ -1,6 +1,46 @@
 import json
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+# Stay below SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds
+MAX_QUERY_PARAMS = 500
+
+# Schema version stored in PRAGMA user_version
+# 1: raw_data is stored as a zlib-compressed BLOB instead of JSON TEXT
+SCHEMA_VERSION = 1
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode_raw(comment: Dict[str, Any]) -> bytes:
+    """Serialize a comment for the raw_data column."""
+    return zlib.compress(_dumps(comment))
+
+
+def _decode_raw(raw_data: Union[bytes, str]) -> Dict[str, Any]:
+    """Deserialize a raw_data value, accepting legacy uncompressed JSON text."""
+    if isinstance(raw_data, bytes):
+        raw_data = zlib.decompress(raw_data)
+    return _loads(raw_data)
 
 
 class CommentDatabase:
@@ -8,6 +48,17 @@ class CommentDatabase:
     Handles storage and retrieval of HackerNews comments in a SQLite database.
     """
 
+    # Statements are kept as fixed strings so sqlite3's statement cache can
+    # reuse their compiled form instead of re-preparing them on every call
+    INSERT_SQL = "INSERT OR IGNORE INTO comments (id, parent_id, by, time, text, raw_data) VALUES (?, ?, ?, ?, ?, ?)"
+    EXISTS_SQL = "SELECT 1 FROM comments WHERE id = ?"
+    SELECT_IDS_SQL = "SELECT id FROM comments"
+    SELECT_RAW_SQL = "SELECT raw_data FROM comments WHERE id = ?"
+    SELECT_ALL_RAW_SQL = "SELECT raw_data FROM comments"
+
+    # Number of compiled statements sqlite3 keeps per connection
+    CACHED_STATEMENTS = 256
+
     def __init__(self, db_path: str = "hn_comments.db"):
         """
         Initialize the database connection and create table if it doesn't exist.
@@ -16,9 +67,33 @@ class CommentDatabase:
             db_path: Path to the SQLite database file
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # One connection is shared by all threads, with writes serialized by
+        # a lock; transactions are started explicitly (autocommit mode)
+        self.conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.CACHED_STATEMENTS,
+        )
         self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # IDs known to be stored, filled in by lookups and this instance's
+        # writes so repeated checks for the same comments skip SQLite
+        self._seen_ids: Set[int] = set()
+        self._configure()
         self._create_tables()
+        self._migrate()
+
+    def _configure(self):
+        """Tune the connection for frequent small writes."""
+        cursor = self.conn.cursor()
+        # WAL appends commits instead of rewriting pages through a rollback
+        # journal, and NORMAL sync only fsyncs at checkpoints in WAL mode
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB
 
     def _create_tables(self):
         """Create the necessary tables if they don't already exist."""
@@ -30,12 +105,47 @@ class CommentDatabase:
             by TEXT,
             time INTEGER,
             text TEXT,
-            raw_data TEXT,
+            raw_data BLOB,
             added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         """)
         self.conn.commit()
 
+    def _migrate(self):
+        """Bring databases created by older versions up to the current schema."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            # Compress rows that were stored as plain JSON text
+            legacy_rows = self.conn.execute(
+                "SELECT id, raw_data FROM comments WHERE typeof(raw_data) = 'text'"
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE comments SET raw_data = ? WHERE id = ?",
+                [
+                    (zlib.compress(row["raw_data"].encode()), row["id"])
+                    for row in legacy_rows
+                ],
+            )
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def load_id_set(self) -> Set[int]:
+        """
+        Load the IDs of all stored comments into memory.
+
+        Existence checks only cache the IDs they look up, so this full scan
+        is opt-in, for long-running callers that check many comments.
+
+        Returns:
+            The set of known comment IDs
+        """
+        cursor = self.conn.execute(self.SELECT_IDS_SQL)
+        self._seen_ids.update(row["id"] for row in cursor.fetchall())
+        return self._seen_ids
+
     def comment_exists(self, comment_id: int) -> bool:
         """
         Check if a comment exists in the database.
@@ -46,9 +156,59 @@ class CommentDatabase:
         Returns:
             True if the comment exists, False otherwise
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT 1 FROM comments WHERE id = ?", (comment_id,))
-        return cursor.fetchone() is not None
+        if comment_id in self._seen_ids:
+            return True
+
+        cursor = self.conn.execute(self.EXISTS_SQL, (comment_id,))
+        if cursor.fetchone() is None:
+            return False
+
+        self._seen_ids.add(comment_id)
+        return True
+
+    def existing_ids(self, comment_ids: Iterable[int]) -> Set[int]:
+        """
+        Find which of the given comments already exist in the database.
+
+        Args:
+            comment_ids: The IDs of the comments to check
+
+        Returns:
+            The subset of the given IDs that exist in the database
+        """
+        existing: Set[int] = set()
+        misses: List[int] = []
+        for comment_id in comment_ids:
+            if comment_id in self._seen_ids:
+                existing.add(comment_id)
+            else:
+                misses.append(comment_id)
+
+        # Look up the rest with bounded IN (...) queries
+        for start in range(0, len(misses), MAX_QUERY_PARAMS):
+            chunk = misses[start : start + MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT id FROM comments WHERE id IN ({placeholders})", chunk
+            )
+            existing.update(row["id"] for row in cursor.fetchall())
+
+        self._seen_ids.update(existing)
+        return existing
+
+    @staticmethod
+    def _comment_row(comment: Dict[str, Any]) -> tuple:
+        """Build the column values stored for a comment."""
+        return (
+            comment.get("id"),
+            comment.get(
+                "parent_id", comment.get("parent")
+            ),  # Try parent_id first, fall back to parent
+            comment.get("by"),
+            comment.get("time"),
+            comment.get("text", ""),
+            _encode_raw(comment),
+        )
 
     def add_comment(self, comment: Dict[str, Any]) -> None:
         """
@@ -57,21 +217,24 @@ class CommentDatabase:
         Args:
             comment: The comment data from HackerNews API
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT OR IGNORE INTO comments (id, parent_id, by, time, text, raw_data) VALUES (?, ?, ?, ?, ?, ?)",
-            (
-                comment.get("id"),
-                comment.get(
-                    "parent_id", comment.get("parent")
-                ),  # Try parent_id first, fall back to parent
-                comment.get("by"),
-                comment.get("time"),
-                comment.get("text", ""),
-                json.dumps(comment),
-            ),
-        )
-        self.conn.commit()
+        self.add_comments_bulk([comment])
+
+    def add_comments_bulk(self, comments: List[Dict[str, Any]]) -> None:
+        """
+        Add several comments to the database in a single transaction.
+
+        Args:
+            comments: The comment data from HackerNews API
+        """
+        rows = [self._comment_row(comment) for comment in comments]
+
+        # The connection context manager commits once for the whole batch,
+        # or rolls it back on error
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(self.INSERT_SQL, rows)
+
+            self._seen_ids.update(comment["id"] for comment in comments)
 
     def get_comment(self, comment_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -83,12 +246,10 @@ class CommentDatabase:
         Returns:
             The comment data as a dictionary, or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT raw_data FROM comments WHERE id = ?", (comment_id,))
-        result = cursor.fetchone()
+        result = self.conn.execute(self.SELECT_RAW_SQL, (comment_id,)).fetchone()
 
         if result:
-            return json.loads(result["raw_data"])
+            return _decode_raw(result["raw_data"])
         return None
 
     def get_all_comments(self) -> List[Dict[str, Any]]:
@@ -98,9 +259,20 @@ class CommentDatabase:
         Returns:
             A list of all comments as dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT raw_data FROM comments")
-        return [json.loads(row["raw_data"]) for row in cursor.fetchall()]
+        return list(self.iter_all_comments())
+
+    def iter_all_comments(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all comments in the database.
+
+        Rows are fetched and decoded one at a time, so memory use stays
+        constant regardless of how many comments are stored.
+
+        Yields:
+            Each comment as a dictionary
+        """
+        for row in self.conn.execute(self.SELECT_ALL_RAW_SQL):
+            yield _decode_raw(row["raw_data"])
 
     def close(self):
         """Close the database connection."""
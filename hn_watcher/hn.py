@@ -1,12 +1,41 @@
+import asyncio
+import json
 import sys
+import threading
 import time
-from typing import Any, Optional, Protocol
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Coroutine,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    TypeGuard,
+    TypeVar,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from hn_watcher.db import CommentDatabase
-from hn_watcher.models import Comment
-from hn_watcher.publisher import PikaPublisher
+from hn_watcher.models import Comment, CommentBatch
+
+if TYPE_CHECKING:
+    from hn_watcher.publisher import PikaPublisher
+
+T = TypeVar("T")
+
+
+def _is_live(item: Optional[dict[str, Any]]) -> TypeGuard[dict[str, Any]]:
+    """Return whether a fetched item exists and is neither deleted nor dead."""
+    if not item:
+        return False
+    return not item.get("deleted") and not item.get("dead")
 
 
 class ApiClient(Protocol):
@@ -20,12 +49,284 @@ class ApiClient(Protocol):
 class RequestsClient:
     """Implementation of ApiClient using the requests library."""
 
+    def __init__(
+        self,
+        pool_maxsize: int = 20,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+    ) -> None:
+        """
+        Initialize the client with a pooled session.
+
+        Args:
+            pool_maxsize: Maximum number of connections kept open per host
+            timeout: Timeout for each request in seconds
+            max_retries: Number of retries for rate-limited or unavailable responses
+            backoff_factor: Base of the exponential delay between retries in seconds
+        """
+        self.timeout = timeout
+        # Reuse TCP/TLS connections across requests instead of reconnecting
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "hn-watcher"
+        # Back off exponentially when the API asks us to slow down
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 503),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
     def get(self, url: str) -> Any:
         """Make a GET request to the specified URL."""
-        response = requests.get(url)
+        response = self._session.get(url, timeout=self.timeout)
         response.raise_for_status()
         return response.json()
 
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._session.close()
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the average request rate while allowing bursts.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens per
+    second. Each request takes a token and only has to wait once the bucket
+    is empty. The limiter is thread safe and not bound to an event loop.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        Initialize the limiter with a full bucket.
+
+        Args:
+            rate: Average number of requests per second, or 0 for no limit
+            burst: Maximum number of requests made without waiting
+                (default: one second worth of requests)
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket.
+
+        Returns:
+            Seconds to wait before the request may be made
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+            # Tokens may go negative, queueing callers behind each other
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        """Block until a request may be made."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be made."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class StreamingHNClient:
+    """
+    Client for the Firebase Server-Sent Events stream of a Hacker News item.
+
+    Firebase pushes ``put``/``patch`` events whenever an item changes, so
+    new kids can be discovered without polling the item.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://hacker-news.firebaseio.com/v0",
+        session: Optional[requests.Session] = None,
+        timeout: float = 60.0,
+    ) -> None:
+        """
+        Initialize the streaming client.
+
+        Args:
+            base_url: Base URL for the Hacker News API
+            session: Session used to open the stream
+            timeout: Seconds to wait for data before the stream is considered dead
+        """
+        self.base_url = base_url
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        # Only close the session if we created it
+        self._owns_session = session is None
+
+    def close(self) -> None:
+        """Close the stream's connections, unless the session was passed in."""
+        if self._owns_session:
+            self.session.close()
+
+    def iter_events(self, url: str) -> Iterator[tuple[str, Any]]:
+        """
+        Subscribe to an event stream and yield its events.
+
+        Args:
+            url: URL of the Firebase resource to follow
+
+        Yields:
+            Tuples of event name and decoded JSON data
+        """
+        with self.session.get(
+            url,
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+
+            event = ""
+            data_lines: list[str] = []
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    field, _, value = line.partition(":")
+                    if field == "event":
+                        event = value.strip()
+                    elif field == "data":
+                        data_lines.append(value.strip())
+                    continue
+
+                # A blank line terminates an event
+                if event:
+                    yield event, json.loads("\n".join(data_lines) or "null")
+                event = ""
+                data_lines = []
+
+    def iter_kid_ids(self, item_id: int) -> Iterator[list[int]]:
+        """
+        Follow an item and yield its kid IDs each time they change.
+
+        Args:
+            item_id: The ID of the HN item to follow
+
+        Yields:
+            The IDs of kids that appeared in each update
+        """
+        url = f"{self.base_url}/item/{item_id}.json"
+        for event, payload in self.iter_events(url):
+            if event in ("cancel", "auth_revoked"):
+                raise ValueError(f"Stream for item {item_id} closed: {event}")
+            if event not in ("put", "patch") or not payload:
+                continue
+
+            path = payload.get("path", "/")
+            data = payload.get("data")
+            if path == "/" and isinstance(data, dict):
+                kid_ids = data.get("kids") or []
+            elif path == "/kids" and isinstance(data, list):
+                kid_ids = data
+            elif path == "/kids" and isinstance(data, dict):
+                kid_ids = list(data.values())
+            elif path.startswith("/kids/") and isinstance(data, int):
+                kid_ids = [data]
+            else:
+                continue
+
+            if kid_ids:
+                yield kid_ids
+
+
+class AlgoliaHNClient:
+    """
+    Client for the Algolia Hacker News search API.
+
+    Algolia returns all comments of a story in a few paged requests, instead
+    of one request per comment, but lags slightly behind the Firebase API.
+    """
+
+    def __init__(
+        self,
+        api_client: ApiClient,
+        base_url: str = "https://hn.algolia.com/api/v1",
+        hits_per_page: int = 1000,
+    ) -> None:
+        """
+        Initialize the search client.
+
+        Args:
+            api_client: Client for making HTTP requests
+            base_url: Base URL for the Algolia search API
+            hits_per_page: Number of comments requested per page
+        """
+        self.api_client = api_client
+        self.base_url = base_url
+        self.hits_per_page = hits_per_page
+
+    def get_story_comments(self, story_id: int) -> list[dict[str, Any]]:
+        """
+        Retrieve all comments of a story, shaped like Firebase items.
+
+        Args:
+            story_id: The ID of the HN story
+
+        Returns:
+            A list of comment items with ``id``, ``by``, ``text``, ``parent``,
+            ``time`` and ``kids`` keys
+        """
+        hits: list[dict[str, Any]] = []
+        page = 0
+        while True:
+            url = (
+                f"{self.base_url}/search?tags=comment,story_{story_id}"
+                f"&hitsPerPage={self.hits_per_page}&page={page}"
+            )
+            result = self.api_client.get(url) or {}
+            hits.extend(result.get("hits") or [])
+
+            page += 1
+            if page >= result.get("nbPages", 0):
+                break
+
+        comments: list[dict[str, Any]] = [
+            {
+                "id": int(hit["objectID"]),
+                "by": hit.get("author"),
+                "text": hit.get("comment_text"),
+                "parent": hit.get("parent_id"),
+                "time": hit.get("created_at_i"),
+                "type": "comment",
+            }
+            for hit in hits
+        ]
+
+        # Algolia only links comments to their parent, so rebuild the kids
+        kids: dict[int, list[int]] = {}
+        for comment in sorted(comments, key=lambda comment: comment["time"] or 0):
+            kids.setdefault(comment["parent"], []).append(comment["id"])
+        for comment in comments:
+            if comment["id"] in kids:
+                comment["kids"] = kids[comment["id"]]
+
+        return comments
+
 
 class HNContext:
     """
@@ -37,9 +338,11 @@ class HNContext:
         self,
         api_client: ApiClient,
         db: CommentDatabase,
-        publisher: PikaPublisher,
-        request_delay: float = 0.1,
+        publisher: "PikaPublisher",
+        rate_limit: float = 20.0,
         base_url: str = "https://hacker-news.firebaseio.com/v0",
+        max_concurrency: int = 10,
+        search_client: Optional[AlgoliaHNClient] = None,
     ):
         """
         Initialize the Hacker News context.
@@ -48,17 +351,24 @@ class HNContext:
             api_client: Client for making HTTP requests
             db: Database for storing comments
             publisher: Message publisher for sending comments to a message broker
-            request_delay: Time to wait between API requests in seconds
+            rate_limit: Maximum average number of API requests per second (0 for no limit)
             base_url: Base URL for the Hacker News API
+            max_concurrency: Maximum number of item requests in flight at once
+            search_client: Client used to fetch all comments of a story at once
         """
         self.api_client = api_client or RequestsClient()
         self.db = db
         self.publisher = publisher
-        self.request_delay = request_delay
+        self.rate_limiter = RateLimiter(rate_limit)
         self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.search_client = search_client
 
     def close(self):
         """Close all connections."""
+        if isinstance(self.api_client, RequestsClient):
+            self.api_client.close()
+
         if self.db:
             self.db.close()
 
@@ -71,31 +381,132 @@ class HackerNewsAPI:
     A client for the Hacker News API that can retrieve comments from a specific item.
     """
 
-    def __init__(self, context: HNContext) -> None:
+    def __init__(
+        self,
+        context: HNContext,
+        item_cache_size: int = 10_000,
+        item_cache_ttl: float = 60.0,
+    ) -> None:
         """
         Initialize the HackerNews API client.
 
         Args:
             context: Context object containing dependencies
+            item_cache_size: Maximum number of fetched items to keep in memory
+            item_cache_ttl: Seconds a cached item is reused before it is fetched again
         """
         self.context = context
+        self.item_cache_size = item_cache_size
+        self.item_cache_ttl = item_cache_ttl
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._item_cache: OrderedDict[int, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def _get_cached_item(self, item_id: int) -> Optional[dict[str, Any]]:
+        """Return a cached item if it was fetched recently enough."""
+        entry = self._item_cache.get(item_id)
+        if entry is None:
+            return None
+
+        fetched_at, item = entry
+        if time.monotonic() - fetched_at > self.item_cache_ttl:
+            del self._item_cache[item_id]
+            return None
+
+        self._item_cache.move_to_end(item_id)
+        return item
+
+    def _cache_item(self, item_id: int, item: Optional[dict[str, Any]]) -> None:
+        """Remember a fetched item, evicting the least recently used one if full."""
+        if not item:
+            return
+
+        self._item_cache[item_id] = (time.monotonic(), item)
+        self._item_cache.move_to_end(item_id)
+        if len(self._item_cache) > self.item_cache_size:
+            self._item_cache.popitem(last=False)
 
-    def get_item(self, item_id: int) -> Optional[dict[str, Any]]:
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine to completion on a fresh event loop.
+
+        A new semaphore is created for every run, since asyncio primitives
+        are bound to the loop they are first used on.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            The result of the coroutine
+        """
+        self._semaphore = asyncio.Semaphore(self.context.max_concurrency)
+        return asyncio.run(coro)
+
+    def get_item(self, item_id: int, fresh: bool = False) -> Optional[dict[str, Any]]:
         """
         Retrieve an item (story, comment, etc.) from the HackerNews API.
 
         Args:
             item_id: The ID of the item to retrieve
+            fresh: Skip the item cache and always fetch from the API
 
         Returns:
             The item data as a dictionary, or None if the item doesn't exist
         """
+        if not fresh:
+            cached = self._get_cached_item(item_id)
+            if cached is not None:
+                return cached
+
         url = f"{self.context.base_url}/item/{item_id}.json"
+        self.context.rate_limiter.acquire()  # Be nice to the API
         result = self.context.api_client.get(url)
-        time.sleep(self.context.request_delay)  # Be nice to the API
 
+        self._cache_item(item_id, result)
+        return result
+
+    async def get_item_async(self, item_id: int) -> Optional[dict[str, Any]]:
+        """
+        Retrieve an item without blocking the event loop.
+
+        The blocking API client call runs in a worker thread, at most
+        ``max_concurrency`` requests are in flight at any time, and requests
+        only wait when the context's rate limit is used up.
+
+        Args:
+            item_id: The ID of the item to retrieve
+
+        Returns:
+            The item data as a dictionary, or None if the item doesn't exist
+        """
+        cached = self._get_cached_item(item_id)
+        if cached is not None:
+            return cached
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.context.max_concurrency)
+
+        url = f"{self.context.base_url}/item/{item_id}.json"
+        async with self._semaphore:
+            await self.context.rate_limiter.acquire_async()  # Be nice to the API
+            result = await asyncio.to_thread(self.context.api_client.get, url)
+
+        self._cache_item(item_id, result)
         return result
 
+    async def get_items_async(
+        self, item_ids: list[int]
+    ) -> list[Optional[dict[str, Any]]]:
+        """
+        Retrieve several items concurrently.
+
+        Args:
+            item_ids: The IDs of the items to retrieve
+
+        Returns:
+            The item data for each ID, in the same order as ``item_ids``
+        """
+        return list(await asyncio.gather(*(self.get_item_async(i) for i in item_ids)))
+
     def get_comments(self, item_id: int, max_depth: int = sys.maxsize) -> list[Comment]:
         """
         Retrieve comments for a given Hacker News item with optional depth limit.
@@ -107,85 +518,139 @@ class HackerNewsAPI:
         Returns:
             A list of comments in the thread up to the specified depth
         """
-        item = self.get_item(item_id)
+        item = self.get_item(item_id, fresh=True)
         if not item:
             return []
 
-        return self._get_all_comments(item, max_depth)
+        comment_dicts = self._run(self._get_all_comment_dicts(item, max_depth))
+        return [Comment.from_api(comment_dict) for comment_dict in comment_dicts]
+
+    def get_comments_soa(
+        self,
+        item_id: int,
+        max_depth: int = sys.maxsize,
+        fields: tuple[str, ...] = ("id", "by", "text"),
+    ) -> dict[str, list[Any]]:
+        """
+        Retrieve comments for an item as columns instead of Comment objects.
+
+        Useful when only a few fields of many comments are needed, since no
+        per-comment objects are built.
+
+        Args:
+            item_id: The ID of the HN item (story, poll, etc.)
+            max_depth: Maximum depth of comments to retrieve (default: unlimited)
+            fields: Names of the comment fields to return
 
-    def _get_all_comments(
+        Returns:
+            A mapping of each field name to its values, in thread order
+        """
+        item = self.get_item(item_id, fresh=True)
+        comment_dicts = (
+            self._run(self._get_all_comment_dicts(item, max_depth)) if item else []
+        )
+        return {
+            field: [comment_dict.get(field) for comment_dict in comment_dicts]
+            for field in fields
+        }
+
+    async def _get_all_comment_dicts(
         self,
         item: dict[str, Any],
         max_depth: int = sys.maxsize,
-        current_depth: int = 0,
-    ) -> list[Comment]:
+    ) -> list[dict[str, Any]]:
         """
-        Recursively collect comments from an item up to a specified depth.
+        Collect comment items from an item up to a specified depth.
+
+        The tree is walked one level at a time, and all kids at a level are
+        fetched together, so a thread of depth D takes D rounds of concurrent
+        requests.
 
         Args:
             item: The parent item or comment
             max_depth: Maximum depth of comments to retrieve
-            current_depth: Current depth in the comment tree
 
         Returns:
-            A list of comments in the thread up to the specified depth
+            A list of raw comment items in thread order, each followed by its replies
         """
-        # If we've reached the maximum depth or the item has no kids, return empty list
-        if current_depth >= max_depth or "kids" not in item or not item["kids"]:
-            return []
-
-        comments = []
-
-        # Retrieve each comment by its ID
-        for kid_id in item["kids"]:
-            comment_dict = self.get_item(kid_id)
-            if not comment_dict:
-                continue
+        replies: dict[int, list[dict[str, Any]]] = {}
+        frontier = [item]
+        depth = 0
+
+        while frontier and depth < max_depth:
+            parents = [parent for parent in frontier if parent.get("kids")]
+            fetched = iter(
+                await self.get_items_async(
+                    [kid_id for parent in parents for kid_id in parent["kids"]]
+                )
+            )
 
-            # Skip deleted or dead comments
-            if comment_dict.get("deleted") or comment_dict.get("dead"):
-                continue
+            frontier = []
+            for parent in parents:
+                kid_dicts = [next(fetched) for _ in parent["kids"]]
+                # Skip missing, deleted or dead comments
+                live_kids = [kid_dict for kid_dict in kid_dicts if _is_live(kid_dict)]
+                replies[parent["id"]] = live_kids
+                frontier.extend(live_kids)
 
-            # Convert to Comment model and add to our list
-            comment = Comment(**comment_dict)
-            comments.append(comment)
+            depth += 1
 
-            # Recursively get child comments and extend the list
-            child_comments = self._get_all_comments(
-                comment_dict, max_depth, current_depth + 1
-            )
-            comments.extend(child_comments)
+        # Flatten depth-first so each comment directly precedes its replies
+        comment_dicts = []
+        stack = list(reversed(replies.get(item["id"], [])))
+        while stack:
+            comment_dict = stack.pop()
+            comment_dicts.append(comment_dict)
+            stack.extend(reversed(replies.get(comment_dict["id"], [])))
 
-        return comments
+        return comment_dicts
 
     def get_top_level_comments(self, item_id: int) -> list[Comment]:
         """
         Retrieve only top-level comments for a given Hacker News item.
 
+        When the context has a search client, all comments are fetched from
+        it in bulk, and only kids it doesn't know about yet are fetched from
+        the Firebase API.
+
         Args:
             item_id: The ID of the HN item (story, poll, etc.)
 
         Returns:
             A list of only top-level comments in the thread
         """
-        item = self.get_item(item_id)
+        item = self.get_item(item_id, fresh=True)
         if not item or "kids" not in item or not item["kids"]:
             return []
 
+        searched: dict[int, dict[str, Any]] = {}
+        if self.context.search_client is not None:
+            try:
+                story_comments = self.context.search_client.get_story_comments(item_id)
+            except requests.RequestException:
+                # Fall back to fetching every kid from Firebase
+                story_comments = []
+            searched = {
+                comment_dict["id"]: comment_dict
+                for comment_dict in story_comments
+                if comment_dict["parent"] == item_id
+            }
+
+        missing_ids = [kid_id for kid_id in item["kids"] if kid_id not in searched]
+        fetched = dict(zip(missing_ids, self._run(self.get_items_async(missing_ids))))
+
         comments = []
 
-        # Retrieve only top-level comments by their ID
+        # Keep the order of the item's kids
         for kid_id in item["kids"]:
-            comment_dict = self.get_item(kid_id)
-            if not comment_dict:
-                continue
+            comment_dict = searched.get(kid_id) or fetched.get(kid_id)
 
-            # Skip deleted or dead comments
-            if comment_dict.get("deleted") or comment_dict.get("dead"):
+            # Skip missing, deleted or dead comments
+            if not _is_live(comment_dict):
                 continue
 
             # Convert to Comment model and add to our list
-            comment = Comment(**comment_dict)
+            comment = Comment.from_api(comment_dict)
             comments.append(comment)
 
         return comments
@@ -201,44 +666,174 @@ class HackerNewsAPI:
         Returns:
             A list of only new top-level comments in the thread
         """
-        item = self.get_item(item_id)
+        return self.hydrate_comments(self.get_new_top_level_comment_ids(item_id))
+
+    def get_new_top_level_comment_ids(self, item_id: int) -> list[int]:
+        """
+        Find the top-level comments of an item that aren't in the database yet.
+
+        Only the item itself is fetched, not its comments.
+
+        Args:
+            item_id: The ID of the HN item (story, poll, etc.)
+
+        Returns:
+            The IDs of new top-level comments, in thread order
+        """
+        item = self.get_item(item_id, fresh=True)
         if not item or "kids" not in item or not item["kids"]:
             return []
 
-        # Use database from context
-        db = self.context.db
-        if db is None:
-            # Create temporary database if needed
-            db = CommentDatabase()
-            temp_db = True
-        else:
-            temp_db = False
+        return self._get_new_ids(item["kids"])
 
-        new_comments = []
+    def hydrate_comments(self, comment_ids: list[int]) -> list[Comment]:
+        """
+        Fetch comments by ID and store them in the database.
 
-        # Retrieve only top-level comments by their ID
-        for kid_id in item["kids"]:
-            # Skip if we've already seen this comment
-            if db.comment_exists(kid_id):
-                continue
+        Args:
+            comment_ids: IDs of the comments to fetch
 
-            comment_dict = self.get_item(kid_id)
-            if not comment_dict:
-                continue
+        Returns:
+            The fetched comments, in the order of ``comment_ids``, skipping
+            missing, deleted or dead ones
+        """
+        return [
+            Comment.from_api(comment_dict)
+            for comment_dict in self._hydrate_comment_dicts(comment_ids)
+        ]
 
-            # Skip deleted or dead comments
-            if comment_dict.get("deleted") or comment_dict.get("dead"):
-                continue
+    def get_new_top_level_comments_batch(self, item_id: int) -> CommentBatch:
+        """
+        Retrieve only new top-level comments for an item as a batch of columns.
 
-            # Convert to Comment model and add to our list
-            comment = Comment(**comment_dict)
-            new_comments.append(comment)
+        Unlike ``get_new_top_level_comments``, no Comment objects are built.
+
+        Args:
+            item_id: The ID of the HN item (story, poll, etc.)
+
+        Returns:
+            The new top-level comments in the thread
+        """
+        item = self.get_item(item_id, fresh=True)
+        if not item or "kids" not in item or not item["kids"]:
+            return CommentBatch()
+
+        return CommentBatch.from_api(self._get_new_comment_dicts(item["kids"]))
 
-            # Store in database
-            db.add_comment(comment_dict)
+    def stream_new_top_level_comments(
+        self, item_id: int, stream_client: Optional["StreamingHNClient"] = None
+    ) -> Iterator[list[Comment]]:
+        """
+        Follow a Hacker News item and yield its new top-level comments as they appear.
+
+        Instead of re-fetching the item every poll, this subscribes to the
+        item's event stream and only fetches the kids that show up in an update.
+        If the stream cannot be opened or breaks, a single regular poll is
+        made instead.
+
+        Args:
+            item_id: The ID of the HN item (story, poll, etc.)
+            stream_client: Client used to subscribe to the item's event stream
+
+        Yields:
+            Lists of new top-level comments, one list per stream update
+        """
+        # Only close a client we created, even if the generator is abandoned
+        own_client = stream_client is None
+        client = stream_client or StreamingHNClient(self.context.base_url)
+
+        try:
+            for kid_ids in client.iter_kid_ids(item_id):
+                yield self._get_new_comments(kid_ids)
+        except (requests.RequestException, ValueError):
+            # Fall back to polling if the stream is unavailable
+            yield self.get_new_top_level_comments(item_id)
+        finally:
+            if own_client:
+                client.close()
+
+    def _get_new_comments(self, kid_ids: list[int]) -> list[Comment]:
+        """
+        Fetch and store the comments among the given IDs that we haven't seen yet.
+
+        Args:
+            kid_ids: IDs of top-level comments of an item
 
-        # Only close the DB connection if we created it
-        if temp_db:
+        Returns:
+            A list of the new comments, in the order of ``kid_ids``
+        """
+        return self.hydrate_comments(self._get_new_ids(kid_ids))
+
+    def _get_new_comment_dicts(self, kid_ids: list[int]) -> list[dict[str, Any]]:
+        """
+        Fetch and store the raw items of the given comments that we haven't seen yet.
+
+        Args:
+            kid_ids: IDs of top-level comments of an item
+
+        Returns:
+            A list of the new comment items, in the order of ``kid_ids``
+        """
+        return self._hydrate_comment_dicts(self._get_new_ids(kid_ids))
+
+    @contextmanager
+    def _database(self) -> Generator[CommentDatabase, None, None]:
+        """
+        Yield the context's database, or a temporary one if it has none.
+
+        Yields:
+            The database to read and store comments with
+        """
+        # Use database from context
+        if self.context.db is not None:
+            yield self.context.db
+            return
+
+        # Create temporary database if needed, and only close it if we created it
+        db = CommentDatabase()
+        try:
+            yield db
+        finally:
             db.close()
 
-        return new_comments
+    def _get_new_ids(self, kid_ids: Iterable[int]) -> list[int]:
+        """
+        Filter out the comment IDs that are already in the database.
+
+        Args:
+            kid_ids: IDs of comments
+
+        Returns:
+            The IDs not seen before, in their original order
+        """
+        kid_ids = list(kid_ids)
+        with self._database() as db:
+            seen = db.existing_ids(kid_ids)
+        return [kid_id for kid_id in kid_ids if kid_id not in seen]
+
+    def _hydrate_comment_dicts(self, comment_ids: list[int]) -> list[dict[str, Any]]:
+        """
+        Fetch raw comment items by ID and store them in the database.
+
+        Args:
+            comment_ids: IDs of the comments to fetch
+
+        Returns:
+            The fetched items, in the order of ``comment_ids``, skipping
+            missing, deleted or dead ones
+        """
+        if not comment_ids:
+            return []
+
+        # Retrieve the comments by their ID, skipping missing, deleted or dead ones
+        comment_dicts = [
+            comment_dict
+            for comment_dict in self._run(self.get_items_async(comment_ids))
+            if _is_live(comment_dict)
+        ]
+
+        # Store all new comments in one transaction
+        with self._database() as db:
+            db.add_comments_bulk(comment_dicts)
+
+        return comment_dicts
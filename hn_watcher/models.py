@@ -1,9 +1,9 @@
-from typing import Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Iterable, Iterator, Optional
 
-from pydantic import BaseModel
 
-
-class Comment(BaseModel):
+@dataclass(slots=True)
+class Comment:
     """A Hacker News comment."""
 
     id: int
@@ -13,3 +13,79 @@ class Comment(BaseModel):
     text: Optional[str] = None
     deleted: Optional[bool] = False
     dead: Optional[bool] = False
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "Comment":
+        """
+        Build a comment from a Hacker News API item.
+
+        Keys that aren't comment fields, such as ``kids`` or ``type``, are
+        ignored.
+
+        Args:
+            data: The item data from the HackerNews API
+
+        Returns:
+            The comment
+        """
+        return cls(**{name: data[name] for name in _FIELD_NAMES if name in data})
+
+
+_FIELD_NAMES = tuple(field.name for field in fields(Comment))
+
+
+@dataclass(slots=True)
+class CommentBatch:
+    """
+    Many Hacker News comments stored as one list per field.
+
+    Useful for large batches, since no per-comment objects are built and
+    each field's values are stored together.
+    """
+
+    ids: list[int] = field(default_factory=list)
+    parent_ids: list[Optional[int]] = field(default_factory=list)
+    bys: list[Optional[str]] = field(default_factory=list)
+    times: list[Optional[int]] = field(default_factory=list)
+    texts: list[Optional[str]] = field(default_factory=list)
+    deleted: list[Optional[bool]] = field(default_factory=list)
+    dead: list[Optional[bool]] = field(default_factory=list)
+
+    @classmethod
+    def from_api(cls, items: Iterable[dict[str, Any]]) -> "CommentBatch":
+        """
+        Build a batch from Hacker News API items.
+
+        Args:
+            items: The item data from the HackerNews API
+
+        Returns:
+            The comments as a batch
+        """
+        batch = cls()
+        for item in items:
+            batch.ids.append(item["id"])
+            batch.parent_ids.append(item.get("parent_id"))
+            batch.bys.append(item.get("by"))
+            batch.times.append(item.get("time"))
+            batch.texts.append(item.get("text"))
+            batch.deleted.append(item.get("deleted", False))
+            batch.dead.append(item.get("dead", False))
+        return batch
+
+    def __len__(self) -> int:
+        """Return the number of comments in the batch."""
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Comment]:
+        """Iterate over the batch as Comment objects."""
+        for row in zip(
+            self.ids,
+            self.parent_ids,
+            self.bys,
+            self.times,
+            self.texts,
+            self.deleted,
+            self.dead,
+        ):
+            yield Comment(*row)
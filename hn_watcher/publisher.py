@@ -1,7 +1,9 @@
+import dataclasses
+import functools
 import io
 import json
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Generator, Iterable, Optional, Union
 
 import avro.io
 import avro.schema
@@ -9,36 +11,166 @@ import pika
 from pika.adapters.blocking_connection import BlockingChannel, BlockingConnection
 from pika.exchange_type import ExchangeType
 
-from hn_watcher.models import Comment
+from hn_watcher.models import Comment, CommentBatch
+
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+# Avro schema for HackerNews comments
+COMMENT_SCHEMA = {
+    "namespace": "hn_watcher.comment",
+    "type": "record",
+    "name": "Comment",
+    "fields": [
+        {"name": "id", "type": "int"},
+        {"name": "parent_id", "type": ["int", "null"]},
+        {"name": "by", "type": ["string", "null"]},
+        {"name": "time", "type": ["int", "null"]},
+        {"name": "text", "type": ["string", "null"]},
+        {"name": "deleted", "type": ["boolean", "null"], "default": False},
+        {"name": "dead", "type": ["boolean", "null"], "default": False},
+    ],
+}
+
+# Built once, since the schema never changes. make_avsc_object reads the dict
+# directly, so the schema doesn't need to be dumped to JSON and parsed back.
+_PARSED_COMMENT_SCHEMA = avro.schema.make_avsc_object(COMMENT_SCHEMA)
+
+
+@functools.lru_cache(maxsize=32)
+def _parsed_schema(schema_json: str) -> avro.schema.Schema:
+    """
+    Parse an Avro schema, reusing the result for schemas seen before.
+
+    Args:
+        schema_json: The schema as JSON, dumped with sorted keys so equal
+            schemas share one cache entry
+
+    Returns:
+        The parsed schema
+    """
+    return avro.schema.parse(schema_json)
+
+
+def _schema_key(schema: dict) -> str:
+    """Dump a schema to JSON with sorted keys, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(schema, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(schema, sort_keys=True)
+
+
+def _as_bytes(routing_key: Union[str, bytes]) -> bytes:
+    """Encode a routing key once, so pika doesn't encode it for every message."""
+    return routing_key.encode() if isinstance(routing_key, str) else routing_key
+
+
+# Avro union branch indexes, zigzag-encoded: 0 selects the value, 1 selects null
+_VALUE_BRANCH = b"\x00"
+_NULL_BRANCH = b"\x02"
+
+
+def _write_long(buf: bytearray, datum: int) -> None:
+    """Append an Avro int or long, as a zigzag variable-length integer."""
+    datum = (datum << 1) ^ (datum >> 63)
+    while datum & ~0x7F:
+        buf.append((datum & 0x7F) | 0x80)
+        datum >>= 7
+    buf.append(datum)
+
+
+def _write_string(buf: bytearray, datum: str) -> None:
+    """Append an Avro string, as its UTF-8 length followed by its bytes."""
+    data = datum.encode("utf-8")
+    _write_long(buf, len(data))
+    buf += data
+
+
+def _encode_fields(
+    buf: bytearray,
+    id: int,
+    parent_id: Optional[int],
+    by: Optional[str],
+    time: Optional[int],
+    text: Optional[str],
+    deleted: Optional[bool],
+    dead: Optional[bool],
+) -> None:
+    """
+    Append a comment in the Avro binary encoding of ``COMMENT_SCHEMA``.
+
+    Specialized for that schema, so no per-field schema dispatch or union
+    resolution happens at runtime. Bytes are appended straight to ``buf``
+    instead of going through an encoder and a file object. Must be kept in
+    sync with the schema.
+
+    Args:
+        buf: Buffer to append the comment to
+        id: Comment ID
+        parent_id: ID of the parent item
+        by: Username of the author
+        time: Creation time as a Unix timestamp
+        text: Comment text
+        deleted: Whether the comment was deleted
+        dead: Whether the comment is dead
+    """
+    _write_long(buf, id)
+
+    if parent_id is None:
+        buf += _NULL_BRANCH
+    else:
+        buf += _VALUE_BRANCH
+        _write_long(buf, parent_id)
+
+    if by is None:
+        buf += _NULL_BRANCH
+    else:
+        buf += _VALUE_BRANCH
+        _write_string(buf, by)
+
+    if time is None:
+        buf += _NULL_BRANCH
+    else:
+        buf += _VALUE_BRANCH
+        _write_long(buf, time)
+
+    if text is None:
+        buf += _NULL_BRANCH
+    else:
+        buf += _VALUE_BRANCH
+        _write_string(buf, text)
+
+    # Booleans are a single 0 or 1 byte
+    if deleted is None:
+        buf += _NULL_BRANCH
+    else:
+        buf += b"\x00\x01" if deleted else b"\x00\x00"
+
+    if dead is None:
+        buf += _NULL_BRANCH
+    else:
+        buf += b"\x00\x01" if dead else b"\x00\x00"
 
 
 class PikaPublisher:
     """Implementation of MessagePublisher using Pika and Avro."""
 
     # Avro schema for HackerNews comments
-    COMMENT_SCHEMA = {
-        "namespace": "hn_watcher.comment",
-        "type": "record",
-        "name": "Comment",
-        "fields": [
-            {"name": "id", "type": "int"},
-            {"name": "parent_id", "type": ["int", "null"]},
-            {"name": "by", "type": ["string", "null"]},
-            {"name": "time", "type": ["int", "null"]},
-            {"name": "text", "type": ["string", "null"]},
-            {"name": "deleted", "type": ["boolean", "null"], "default": False},
-            {"name": "dead", "type": ["boolean", "null"], "default": False},
-        ],
-    }
+    COMMENT_SCHEMA = COMMENT_SCHEMA
 
     def __init__(
         self,
         host: str = "localhost",
         exchange: str = "hackernews",
-        exchange_type: ExchangeType = ExchangeType.topic,
+        exchange_type: Union[str, ExchangeType] = ExchangeType.topic,
         durable: bool = True,
         username: str = "guest",
         password: str = "guest",
+        confirm_delivery: bool = False,
+        transient: bool = False,
+        heartbeat: Optional[int] = None,
+        generic_encoder: bool = False,
     ):
         """
         Initialize the Pika publisher.
@@ -50,16 +182,41 @@ class PikaPublisher:
             durable: Whether the exchange should be durable
             username: RabbitMQ username
             password: RabbitMQ password
+            confirm_delivery: Wait for the broker to confirm each published message.
+                Safer, but every publish then costs a full round-trip to the broker.
+            transient: Publish non-persistent messages. Much faster, since the
+                broker doesn't write each message to disk, but queued messages
+                are lost if the broker restarts.
+            heartbeat: Heartbeat timeout in seconds, so an idle connection is kept
+                alive between publishes. None accepts the broker's value.
+            generic_encoder: Serialize with Avro's generic DatumWriter instead of
+                the encoder specialized for the comment schema.
         """
         self.host = host
         self.exchange = exchange
-        self.exchange_type = exchange_type
+        self.exchange_type = ExchangeType(exchange_type)
         self.durable = durable
         self.username = username
         self.password = password
+        self.confirm_delivery = confirm_delivery
+        self.transient = transient
+        self.heartbeat = heartbeat
+        self.generic_encoder = generic_encoder
         self._connection: Optional[BlockingConnection] = None
         self._channel: Optional[BlockingChannel] = None
-        self.avro_schema = avro.schema.parse(json.dumps(self.COMMENT_SCHEMA))
+        if self.COMMENT_SCHEMA is COMMENT_SCHEMA:
+            self.avro_schema = _PARSED_COMMENT_SCHEMA
+        else:
+            # Subclasses may publish a different schema, which the specialized
+            # encoder doesn't know about
+            self.avro_schema = _parsed_schema(_schema_key(self.COMMENT_SCHEMA))
+            self.generic_encoder = True
+
+        # Reused for every message instead of being rebuilt per publish
+        self._buf = bytearray()
+        self._writer = avro.io.DatumWriter(self.avro_schema)
+        self._generic_buf = io.BytesIO()
+        self._encoder = avro.io.BinaryEncoder(self._generic_buf)
 
     @property
     def is_connected(self) -> bool:
@@ -74,10 +231,48 @@ class PikaPublisher:
     @property
     def channel(self) -> BlockingChannel:
         """Get the active channel."""
-        if not self.is_connected:
+        # A channel is closed along with its connection, so checking it is enough
+        channel = self._channel
+        if channel is None or channel.is_closed:
             raise RuntimeError("Not connected to RabbitMQ")
-        if self._channel is None:
-            raise RuntimeError("Channel is not open")
+        return channel
+
+    def _get_or_open_channel(self) -> BlockingChannel:
+        """
+        Return the open channel, connecting to RabbitMQ first if needed.
+
+        Returns:
+            An active channel for publishing messages.
+        """
+        channel = self._channel
+        if channel is None or channel.is_closed:
+            channel = self._open_channel()
+        return channel
+
+    def _open_channel(self) -> BlockingChannel:
+        """
+        Connect to RabbitMQ and open a channel with the exchange declared.
+
+        Returns:
+            The new channel
+        """
+        # Don't leak a connection whose channel was closed by the broker
+        self.close()
+
+        credentials = pika.PlainCredentials(self.username, self.password)
+        self._connection = pika.BlockingConnection(
+            pika.ConnectionParameters(
+                host=self.host, credentials=credentials, heartbeat=self.heartbeat
+            )
+        )
+        self._channel = self._connection.channel()
+        self._channel.exchange_declare(
+            exchange=self.exchange,
+            exchange_type=self.exchange_type,
+            durable=self.durable,
+        )
+        if self.confirm_delivery:
+            self._channel.confirm_delivery()
         return self._channel
 
     @contextmanager
@@ -95,24 +290,46 @@ class PikaPublisher:
             ```
         """
         try:
-            if not self.is_connected:
-                credentials = pika.PlainCredentials(self.username, self.password)
-                self._connection = pika.BlockingConnection(
-                    pika.ConnectionParameters(host=self.host, credentials=credentials)
-                )
-                self._channel = self._connection.channel()
-                self._channel.exchange_declare(
-                    exchange=self.exchange,
-                    exchange_type=self.exchange_type,
-                    durable=self.durable,
-                )
-            yield self.channel
+            yield self._get_or_open_channel()
         except Exception as e:
             self.close()  # Ensure cleanup on error
             raise e
 
+    def encode_comment(self, comment: Comment) -> bytes:
+        """
+        Serialize a comment using Avro.
+
+        Not thread safe: the Avro writer and its buffer are shared between
+        calls, so use one publisher per thread.
+
+        Args:
+            comment: HackerNews comment to serialize
+
+        Returns:
+            The Avro-encoded comment
+        """
+        if not self.generic_encoder:
+            buf = self._buf
+            buf.clear()
+            _encode_fields(
+                buf,
+                comment.id,
+                comment.parent_id,
+                comment.by,
+                comment.time,
+                comment.text,
+                comment.deleted,
+                comment.dead,
+            )
+            return bytes(buf)
+
+        self._generic_buf.seek(0)
+        self._generic_buf.truncate()
+        self._writer.write(dataclasses.asdict(comment), self._encoder)
+        return self._generic_buf.getvalue()
+
     def publish_comment(
-        self, comment: Comment, routing_key: str = "comment.new"
+        self, comment: Comment, routing_key: Union[str, bytes] = b"comment.new"
     ) -> None:
         """
         Publish a comment to the RabbitMQ exchange using Avro encoding.
@@ -121,35 +338,107 @@ class PikaPublisher:
             comment: HackerNews comment to publish
             routing_key: Routing key for the message
         """
-        # Prepare the record for Avro serialization
-        record = {
-            "id": comment.id,
-            "parent_id": comment.parent_id,
-            "by": comment.by,
-            "time": comment.time,
-            "text": comment.text,
-            "deleted": comment.deleted,
-            "dead": comment.dead,
-        }
-
-        # Serialize the record using Avro
-        buf = io.BytesIO()
-        encoder = avro.io.BinaryEncoder(buf)
-        writer = avro.io.DatumWriter(self.avro_schema)
-        writer.write(record, encoder)
-        avro_bytes = buf.getvalue()
-
-        # Publish the message using the context manager
-        with self.connection() as channel:
-            channel.basic_publish(
-                exchange=self.exchange,
-                routing_key=routing_key,
-                body=avro_bytes,
-                properties=pika.BasicProperties(
-                    content_type="avro/binary",
-                    delivery_mode=2,  # Persistent
-                ),
-            )
+        self.publish_comments([comment], routing_key)
+
+    def publish_comments(
+        self,
+        comments: Iterable[Comment],
+        routing_key: Union[str, bytes] = b"comment.new",
+    ) -> None:
+        """
+        Publish several comments to the RabbitMQ exchange using Avro encoding.
+
+        All comments are serialized before the first one is sent, and are
+        then published on a single channel.
+
+        Args:
+            comments: HackerNews comments to publish
+            routing_key: Routing key for the messages
+        """
+        routing_key = _as_bytes(routing_key)
+        encode_comment = self.encode_comment
+        self.publish_raw_batch(
+            [(routing_key, encode_comment(comment)) for comment in comments]
+        )
+
+    def encode_batch(self, batch: CommentBatch) -> list[bytes]:
+        """
+        Serialize every comment of a batch using Avro.
+
+        Args:
+            batch: HackerNews comments to serialize
+
+        Returns:
+            The Avro-encoded comments, in batch order
+        """
+        if self.generic_encoder:
+            return [self.encode_comment(comment) for comment in batch]
+
+        buf = self._buf
+        bodies: list[bytes] = []
+        append = bodies.append
+        for row in zip(
+            batch.ids,
+            batch.parent_ids,
+            batch.bys,
+            batch.times,
+            batch.texts,
+            batch.deleted,
+            batch.dead,
+        ):
+            buf.clear()
+            _encode_fields(buf, *row)
+            append(bytes(buf))
+        return bodies
+
+    def publish_batch(
+        self, batch: CommentBatch, routing_key: Union[str, bytes] = b"comment.new"
+    ) -> None:
+        """
+        Publish a batch of comments to the RabbitMQ exchange using Avro encoding.
+
+        Args:
+            batch: HackerNews comments to publish
+            routing_key: Routing key for the messages
+        """
+        routing_key = _as_bytes(routing_key)
+        self.publish_raw_batch(
+            [(routing_key, body) for body in self.encode_batch(batch)]
+        )
+
+    def publish_raw_batch(
+        self, payloads: Iterable[tuple[Union[str, bytes], bytes]]
+    ) -> None:
+        """
+        Publish already encoded messages on a single channel.
+
+        Args:
+            payloads: Pairs of routing key and Avro-encoded message body
+        """
+        payloads = list(payloads)
+        if not payloads:
+            return
+
+        properties = pika.BasicProperties(
+            content_type="avro/binary",
+            delivery_mode=1 if self.transient else 2,  # Transient or persistent
+        )
+
+        exchange = self.exchange
+        try:
+            # Look the bound method up once for the whole batch
+            basic_publish = self._get_or_open_channel().basic_publish
+            for routing_key, body in payloads:
+                basic_publish(
+                    exchange=exchange,
+                    # pika sends bytes routing keys as they are
+                    routing_key=routing_key,  # type: ignore[arg-type]
+                    body=body,
+                    properties=properties,
+                )
+        except Exception:
+            self.close()  # Ensure cleanup on error
+            raise
 
     def close(self) -> None:
         """Close the connection to RabbitMQ."""
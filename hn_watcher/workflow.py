@@ -3,8 +3,10 @@ Workflow module for coordinating HackerNews API operations, database storage,
 and message publishing.
 """
 
+from typing import Iterator
+
 from hn_watcher.hn import HackerNewsAPI, HNContext
-from hn_watcher.models import Comment
+from hn_watcher.models import Comment, CommentBatch
 
 
 class NewCommentPublisher:
@@ -27,7 +29,7 @@ class NewCommentPublisher:
         """
         Retrieve only new top-level comments for a given Hacker News item.
         Checks the database to avoid fetching comments we've already seen.
-        If a publisher is available, publishes each new comment to the message broker.
+        If a publisher is available, publishes the new comments to the message broker.
 
         Args:
             item_id: The ID of the HN item (story, poll, etc.)
@@ -35,12 +37,59 @@ class NewCommentPublisher:
         Returns:
             A list of only new top-level comments in the thread
         """
-        new_comments = self.hn_api.get_new_top_level_comments(item_id)
+        # Only fetch the comments once we know some of them are new
+        new_ids = self.hn_api.get_new_top_level_comment_ids(item_id)
+        if not new_ids:
+            return []
+
+        new_comments = self.hn_api.hydrate_comments(new_ids)
+        self._publish(item_id, new_comments)
+        return new_comments
 
-        # Publish comment if publisher is available
-        if self.context.publisher:
+    def publish_new_comment_batch(self, item_id: int) -> CommentBatch:
+        """
+        Like ``publish_new_comments``, but keeps the comments as a batch of columns.
+
+        Cheaper for items with many new comments, since no Comment objects
+        are built on the way from the API to the message broker.
+
+        Args:
+            item_id: The ID of the HN item (story, poll, etc.)
+
+        Returns:
+            The new top-level comments in the thread
+        """
+        batch = self.hn_api.get_new_top_level_comments_batch(item_id)
+        if self.context.publisher and len(batch):
             routing_key = f"comment.item.{item_id}"
-            for comment in new_comments:
-                self.context.publisher.publish_comment(comment, routing_key)
+            self.context.publisher.publish_batch(batch, routing_key)
+        return batch
 
-        return new_comments
+    def follow_new_comments(self, item_id: int) -> Iterator[list[Comment]]:
+        """
+        Follow a Hacker News item and publish new top-level comments as they appear.
+
+        Uses the item's event stream instead of polling, falling back to a
+        single poll if the stream is unavailable.
+
+        Args:
+            item_id: The ID of the HN item (story, poll, etc.)
+
+        Yields:
+            Lists of new top-level comments, one list per stream update
+        """
+        for new_comments in self.hn_api.stream_new_top_level_comments(item_id):
+            self._publish(item_id, new_comments)
+            yield new_comments
+
+    def _publish(self, item_id: int, comments: list[Comment]) -> None:
+        """
+        Publish comments for an item if a publisher is available.
+
+        Args:
+            item_id: The ID of the HN item the comments belong to
+            comments: The comments to publish
+        """
+        if self.context.publisher and comments:
+            routing_key = f"comment.item.{item_id}"
+            self.context.publisher.publish_comments(comments, routing_key)
@@ -2,16 +2,27 @@
 Pytest configuration and fixtures for HN Watcher tests.
 """
 
-import os
-import tempfile
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
 from pika.exchange_type import ExchangeType
 
 from hn_watcher.db import CommentDatabase
 from hn_watcher.hn import HNContext
-from hn_watcher.models import Comment
+from hn_watcher.models import Comment, CommentBatch
+from hn_watcher.workflow import NewCommentPublisher
+
+BASE_URL = "https://hacker-news.firebaseio.com/v0"
+
+
+def url_for_item(item_id: int) -> str:
+    """Return the Firebase API URL for an item."""
+    return f"{BASE_URL}/item/{item_id}.json"
+
+
+def build_responses(*items: Dict[str, Any]) -> Dict[str, Any]:
+    """Return mock API responses serving each of the given items."""
+    return {url_for_item(item["id"]): item for item in items}
 
 
 class MockApiClient:
@@ -41,17 +52,33 @@ class MockPublisher:
     
     def __init__(self):
         """Initialize the mock publisher."""
-        self.published_comments: List[Comment] = []
-        self.routing_keys: List[str] = []
+        self.published: List[Tuple[Comment, str]] = []
         self.host = "localhost"
         self.exchange = "hackernews"
         self.exchange_type = ExchangeType.topic
         self.durable = True
     
+    @property
+    def published_comments(self) -> List[Comment]:
+        """Return the published comments, in publishing order."""
+        return [comment for comment, _ in self.published]
+
+    @property
+    def routing_keys(self) -> List[str]:
+        """Return the routing key of each published comment."""
+        return [routing_key for _, routing_key in self.published]
+
     def publish_comment(self, comment: Comment, routing_key: str) -> None:
         """Record the published comment."""
-        self.published_comments.append(comment)
-        self.routing_keys.append(routing_key)
+        self.published.append((comment, routing_key))
+
+    def publish_comments(self, comments: List[Comment], routing_key: str) -> None:
+        """Record the published comments."""
+        self.published.extend((comment, routing_key) for comment in comments)
+
+    def publish_batch(self, batch: CommentBatch, routing_key: str) -> None:
+        """Record the comments of a published batch."""
+        self.publish_comments(list(batch), routing_key)
     
     def connect(self) -> None:
         """Mock connection establishment."""
@@ -63,12 +90,9 @@ class MockPublisher:
 
 
 @pytest.fixture
-def temp_db_path() -> str:
-    """Create a temporary database file for testing."""
-    fd, path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-    yield path
-    os.unlink(path)
+def temp_db_path(tmp_path) -> str:
+    """Return a path for a temporary database file, removed by pytest."""
+    return str(tmp_path / "test.db")
 
 
 @pytest.fixture
@@ -93,6 +117,12 @@ def mock_context(mock_api_client: MockApiClient, mock_publisher: MockPublisher,
     )
 
 
+@pytest.fixture
+def publisher(mock_context: HNContext) -> NewCommentPublisher:
+    """Return a comment publisher wired to the mock context."""
+    return NewCommentPublisher(mock_context)
+
+
 @pytest.fixture
 def sample_item() -> Dict[str, Any]:
     """Return a sample HN item (story)."""
@@ -131,4 +161,10 @@ def sample_comments() -> List[Dict[str, Any]]:
             "time": 1617235500,
             "text": "Comment 3",
         },
-    ]
\ No newline at end of file
+    ]
+
+
+@pytest.fixture
+def responses_base(sample_item: Dict[str, Any], sample_comments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return mock API responses for the sample item and its comments."""
+    return build_responses(sample_item, *sample_comments)
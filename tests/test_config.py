@@ -0,0 +1,44 @@
+"""
+Tests for the config module.
+"""
+
+import os
+
+import pytest
+
+from hn_watcher.config import clear_config_cache, load_config
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start and end every test with an empty config cache."""
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+class TestLoadConfig:
+    """Tests for the load_config function."""
+
+    def test_defaults_without_file(self, tmp_path):
+        """Test that defaults are returned when the file doesn't exist."""
+        config = load_config(str(tmp_path / "missing.toml"))
+        assert config["database"]["path"] == "hn_comments.db"
+        assert config["api"]["max_concurrency"] == 10
+
+    def test_merges_file_and_reloads_on_change(self, tmp_path):
+        """Test that cached config is reused until the file changes."""
+        path = tmp_path / "config.toml"
+        path.write_text('[database]\npath = "first.db"\n')
+
+        assert load_config(str(path))["database"]["path"] == "first.db"
+
+        # Callers can't modify the cached copy
+        load_config(str(path))["database"]["path"] = "mutated.db"
+        assert load_config(str(path))["database"]["path"] == "first.db"
+
+        path.write_text('[database]\npath = "second.db"\n')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert load_config(str(path))["database"]["path"] == "second.db"
@@ -5,6 +5,9 @@ Tests for the database module.
 import json
 import os
 import sqlite3
+import threading
+import zlib
+from dataclasses import asdict
 
 import pytest
 
@@ -31,6 +34,10 @@ class TestCommentDatabase:
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='comments'")
         assert cursor.fetchone() is not None
         
+        # Verify the connection was tuned for writes
+        assert cursor.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert cursor.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
         # Clean up
         db.close()
     
@@ -49,17 +56,68 @@ class TestCommentDatabase:
             time=1617235300,
             text="Test comment",
         )
-        db.add_comment(comment.model_dump())
+        db.add_comment(asdict(comment))
         
         # Now it should exist
         assert db.comment_exists(1001) is True
         
         # Another comment still shouldn't exist
         assert db.comment_exists(1002) is False
-        
+
         # Clean up
         db.close()
-    
+
+    def test_existing_ids(self, temp_db_path):
+        """Test looking up which comments exist in a single batch."""
+        db = CommentDatabase(temp_db_path)
+
+        # Initially, no comments should exist
+        assert db.existing_ids([1001, 1002]) == set()
+
+        # Add a comment
+        db.add_comment({"id": 1001, "parent": 12345, "by": "testuser", "text": "Test comment"})
+
+        assert db.existing_ids([1001, 1002]) == {1001}
+        assert db.existing_ids([]) == set()
+
+        # Lookups larger than one query's parameter limit are chunked
+        assert db.existing_ids(range(1, 2000)) == {1001}
+
+        # Clean up
+        db.close()
+
+    def test_seen_id_cache(self, temp_db_path):
+        """Test that existence checks use the in-memory ID set."""
+        db = CommentDatabase(temp_db_path)
+        db.add_comment({"id": 1001, "parent": 12345, "by": "testuser"})
+
+        # Lookups only query the IDs they ask about, never the whole table
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        assert db.existing_ids([1001, 1005]) == {1001}
+        assert db.comment_exists(1005) is False
+        db.conn.set_trace_callback(None)
+        assert statements == [
+            "SELECT id FROM comments WHERE id IN (1005)",
+            "SELECT 1 FROM comments WHERE id = 1005",
+        ]
+
+        # The full set is loaded on request and follows our own writes
+        assert db.load_id_set() == {1001}
+        db.add_comment({"id": 1002, "parent": 12345, "by": "testuser"})
+        assert db.load_id_set() == {1001, 1002}
+
+        # Comments written by another connection are still found
+        other = CommentDatabase(temp_db_path)
+        other.add_comment({"id": 1003, "parent": 12345, "by": "testuser"})
+        other.close()
+        assert db.comment_exists(1003) is True
+        assert db.existing_ids([1001, 1003, 1004]) == {1001, 1003}
+        assert 1003 in db.load_id_set()
+
+        # Clean up
+        db.close()
+
     def test_add_comment(self, temp_db_path):
         """Test adding a comment to the database."""
         db = CommentDatabase(temp_db_path)
@@ -73,7 +131,7 @@ class TestCommentDatabase:
         )
         
         # Add the comment
-        db.add_comment(comment.model_dump())
+        db.add_comment(asdict(comment))
         
         # Verify it was added
         cursor = db.conn.cursor()
@@ -86,10 +144,10 @@ class TestCommentDatabase:
         assert result["by"] == "testuser"
         assert result["time"] == 1617235300
         assert result["text"] == "Test comment"
-        assert json.loads(result["raw_data"]) == comment.model_dump()
+        assert json.loads(zlib.decompress(result["raw_data"])) == asdict(comment)
         
         # Adding it again should not cause an error
-        db.add_comment(comment.model_dump())
+        db.add_comment(asdict(comment))
         
         # Check if there's still only one record
         cursor.execute("SELECT COUNT(*) as count FROM comments WHERE id = ?", (1001,))
@@ -98,6 +156,66 @@ class TestCommentDatabase:
         # Clean up
         db.close()
     
+    def test_add_comments_bulk(self, temp_db_path, sample_comments):
+        """Test adding several comments in one transaction."""
+        db = CommentDatabase(temp_db_path)
+
+        db.add_comments_bulk(sample_comments)
+
+        # Comments should be committed and visible to other connections
+        other = sqlite3.connect(temp_db_path)
+        assert other.execute("SELECT COUNT(*) FROM comments").fetchone()[0] == 3
+        assert other.execute("SELECT parent_id FROM comments WHERE id = 1001").fetchone()[0] == 12345
+        other.close()
+
+        # Adding them again should be ignored
+        db.add_comments_bulk(sample_comments)
+        assert len(db.get_all_comments()) == 3
+
+        # An empty batch is a no-op
+        db.add_comments_bulk([])
+
+        # Clean up
+        db.close()
+
+    def test_add_comments_from_threads(self, temp_db_path):
+        """Test that one database can be shared by several writer threads."""
+        db = CommentDatabase(temp_db_path)
+
+        def write(start):
+            db.add_comments_bulk([{"id": start + i, "parent": 12345} for i in range(50)])
+
+        threads = [threading.Thread(target=write, args=(start,)) for start in range(0, 200, 50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert db.existing_ids(range(200)) == set(range(200))
+
+        # Clean up
+        db.close()
+
+    def test_migrates_legacy_text_rows(self, temp_db_path):
+        """Test that uncompressed rows from older databases are compressed on open."""
+        legacy = sqlite3.connect(temp_db_path)
+        legacy.execute(
+            "CREATE TABLE comments (id INTEGER PRIMARY KEY, parent_id INTEGER, by TEXT, "
+            "time INTEGER, text TEXT, raw_data TEXT, added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        raw = {"id": 1001, "parent": 12345, "by": "testuser", "text": "Old comment"}
+        legacy.execute("INSERT INTO comments (id, raw_data) VALUES (?, ?)", (1001, json.dumps(raw)))
+        legacy.commit()
+        legacy.close()
+
+        db = CommentDatabase(temp_db_path)
+        assert db.get_comment(1001) == raw
+        assert db.conn.execute("SELECT typeof(raw_data) FROM comments").fetchone()[0] == "blob"
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == 1
+
+        # Clean up
+        db.close()
+
     def test_get_comment(self, temp_db_path):
         """Test retrieving a comment from the database."""
         db = CommentDatabase(temp_db_path)
@@ -113,11 +231,11 @@ class TestCommentDatabase:
             time=1617235300,
             text="Test comment",
         )
-        db.add_comment(comment.model_dump())
+        db.add_comment(asdict(comment))
         
         # Now retrieving it should work
         result = db.get_comment(1001)
-        assert result == comment.model_dump()
+        assert result == asdict(comment)
         
         # Clean up
         db.close()
@@ -148,7 +266,7 @@ class TestCommentDatabase:
         ]
         
         for comment in comments:
-            db.add_comment(comment.model_dump())
+            db.add_comment(asdict(comment))
         
         # Now retrieving all should return both
         result = db.get_all_comments()
@@ -162,6 +280,18 @@ class TestCommentDatabase:
         # Clean up
         db.close()
     
+    def test_iter_all_comments(self, temp_db_path, sample_comments):
+        """Test lazily iterating over all comments."""
+        db = CommentDatabase(temp_db_path)
+        db.add_comments_bulk(sample_comments)
+
+        comments = db.iter_all_comments()
+        assert next(comments) == sample_comments[0]
+        assert list(comments) == sample_comments[1:]
+
+        # Clean up
+        db.close()
+
     def test_close(self, temp_db_path):
         """Test closing the database connection."""
         db = CommentDatabase(temp_db_path)
@@ -0,0 +1,359 @@
+"""
+Tests for the Hacker News API module.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from hn_watcher.hn import (
+    AlgoliaHNClient,
+    HackerNewsAPI,
+    RateLimiter,
+    RequestsClient,
+    StreamingHNClient,
+)
+from hn_watcher.models import Comment
+
+
+class TestHackerNewsAPI:
+    """Tests for the HackerNewsAPI class."""
+
+    def test_get_comments_keeps_thread_order(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that replies fetched concurrently still follow their parent comment."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        sample_comments[0]["kids"] = [2001]
+        reply = {"id": 2001, "parent": 1001, "by": "user4", "time": 1617235600, "text": "Reply"}
+        mock_api_client.responses = {
+            f"{base_url}/item/{sample_item['id']}.json": sample_item,
+            f"{base_url}/item/{sample_comments[0]['id']}.json": sample_comments[0],
+            f"{base_url}/item/{sample_comments[1]['id']}.json": sample_comments[1],
+            f"{base_url}/item/{sample_comments[2]['id']}.json": sample_comments[2],
+            f"{base_url}/item/{reply['id']}.json": reply,
+        }
+
+        api = HackerNewsAPI(mock_context)
+        result = api.get_comments(sample_item["id"])
+
+        assert all(isinstance(comment, Comment) for comment in result)
+        assert [comment.id for comment in result] == [1001, 2001, 1002, 1003]
+        assert len(mock_api_client.get_calls) == 5  # item + 3 comments + 1 reply
+
+    def test_get_comments_fetches_one_level_at_a_time(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that deep threads are walked level by level but returned depth-first."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        sample_comments[0]["kids"] = [2001]
+        sample_comments[2]["kids"] = [2002]
+        replies = [
+            {"id": 2001, "parent": 1001, "by": "user4", "text": "Reply 1", "kids": [3001]},
+            {"id": 2002, "parent": 1003, "by": "user5", "text": "Reply 2"},
+            {"id": 3001, "parent": 2001, "by": "user6", "text": "Nested reply"},
+        ]
+        mock_api_client.responses = {
+            f"{base_url}/item/{item['id']}.json": item
+            for item in [sample_item, *sample_comments, *replies]
+        }
+
+        api = HackerNewsAPI(mock_context)
+        result = api.get_comments(sample_item["id"])
+
+        assert [comment.id for comment in result] == [1001, 2001, 3001, 1002, 1003, 2002]
+        fetched_ids = [int(url.rsplit("/", 1)[1].split(".")[0]) for url in mock_api_client.get_calls]
+        assert set(fetched_ids[1:4]) == {1001, 1002, 1003}
+        assert set(fetched_ids[4:6]) == {2001, 2002}
+        assert fetched_ids[6:] == [3001]
+
+    def test_get_comments_respects_max_depth(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that replies below the depth limit are not fetched."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        sample_comments[0]["kids"] = [2001]
+        mock_api_client.responses = {
+            f"{base_url}/item/{sample_item['id']}.json": sample_item,
+            f"{base_url}/item/{sample_comments[0]['id']}.json": sample_comments[0],
+            f"{base_url}/item/{sample_comments[1]['id']}.json": sample_comments[1],
+            f"{base_url}/item/{sample_comments[2]['id']}.json": sample_comments[2],
+        }
+
+        api = HackerNewsAPI(mock_context)
+        result = api.get_comments(sample_item["id"], max_depth=1)
+
+        assert [comment.id for comment in result] == [1001, 1002, 1003]
+        assert len(mock_api_client.get_calls) == 4  # item + 3 comments
+
+    def test_get_comments_soa(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test retrieving comments as columns."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        mock_api_client.responses = {
+            f"{base_url}/item/{sample_item['id']}.json": sample_item,
+            **{f"{base_url}/item/{comment['id']}.json": comment for comment in sample_comments},
+        }
+
+        api = HackerNewsAPI(mock_context)
+        result = api.get_comments_soa(sample_item["id"])
+
+        assert result == {
+            "id": [1001, 1002, 1003],
+            "by": ["user1", "user2", "user3"],
+            "text": ["Comment 1", "Comment 2", "Comment 3"],
+        }
+
+    def test_get_comments_reuses_cached_items(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that a repeated traversal only re-fetches the root item."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        mock_api_client.responses = {
+            f"{base_url}/item/{sample_item['id']}.json": sample_item,
+            **{f"{base_url}/item/{comment['id']}.json": comment for comment in sample_comments},
+        }
+
+        api = HackerNewsAPI(mock_context)
+        first = api.get_comments(sample_item["id"])
+        second = api.get_comments(sample_item["id"])
+
+        assert [comment.id for comment in second] == [comment.id for comment in first]
+        assert len(mock_api_client.get_calls) == 5  # root twice, each comment once
+
+        # Expired entries are fetched again
+        api.item_cache_ttl = -1
+        api.get_comments(sample_item["id"])
+        assert len(mock_api_client.get_calls) == 9
+
+    def test_get_top_level_comments_from_search(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that top-level comments come from search, with Firebase for the rest."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        mock_api_client.responses = {
+            f"{base_url}/item/{sample_item['id']}.json": sample_item,
+            f"{base_url}/item/{sample_comments[2]['id']}.json": sample_comments[2],
+        }
+        search_client = MagicMock()
+        search_client.get_story_comments.return_value = [
+            sample_comments[1],
+            sample_comments[0],
+            {"id": 2001, "parent": 1001, "by": "user4", "text": "Reply"},
+        ]
+        mock_context.search_client = search_client
+
+        api = HackerNewsAPI(mock_context)
+        result = api.get_top_level_comments(sample_item["id"])
+
+        assert [comment.id for comment in result] == [1001, 1002, 1003]
+        # Only the story and the comment missing from search hit Firebase
+        assert mock_api_client.get_calls == [
+            f"{base_url}/item/{sample_item['id']}.json",
+            f"{base_url}/item/{sample_comments[2]['id']}.json",
+        ]
+
+        # Search failures fall back to fetching every kid
+        search_client.get_story_comments.side_effect = requests.ConnectionError("down")
+        for comment in sample_comments:
+            mock_api_client.responses[f"{base_url}/item/{comment['id']}.json"] = comment
+        mock_api_client.get_calls.clear()
+        api = HackerNewsAPI(mock_context)
+        assert [comment.id for comment in api.get_top_level_comments(sample_item["id"])] == [1001, 1002, 1003]
+        assert len(mock_api_client.get_calls) == 4
+
+    def test_new_comment_ids_then_hydrate(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test finding new comment IDs without fetching the comments."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        mock_api_client.responses = {
+            f"{base_url}/item/{item['id']}.json": item
+            for item in [sample_item, *sample_comments]
+        }
+        mock_context.db.add_comment(sample_comments[0])
+
+        api = HackerNewsAPI(mock_context)
+        new_ids = api.get_new_top_level_comment_ids(sample_item["id"])
+
+        assert new_ids == [1002, 1003]
+        assert mock_api_client.get_calls == [f"{base_url}/item/{sample_item['id']}.json"]
+
+        comments = api.hydrate_comments(new_ids)
+        assert [comment.id for comment in comments] == [1002, 1003]
+        assert mock_context.db.existing_ids(new_ids) == {1002, 1003}
+        assert api.get_new_top_level_comment_ids(sample_item["id"]) == []
+
+    def test_stream_new_top_level_comments(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that only kids appearing in stream updates are fetched."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        mock_api_client.responses = {
+            f"{base_url}/item/{comment['id']}.json": comment for comment in sample_comments
+        }
+        stream_client = MagicMock()
+        stream_client.iter_kid_ids.return_value = iter([[1001, 1002], [1003, 1001, 1002]])
+
+        api = HackerNewsAPI(mock_context)
+        batches = list(api.stream_new_top_level_comments(sample_item["id"], stream_client))
+
+        assert [[comment.id for comment in batch] for batch in batches] == [[1001, 1002], [1003]]
+        assert len(mock_api_client.get_calls) == 3  # each kid fetched once, never the story
+
+    def test_stream_falls_back_to_polling(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that a failing stream falls back to a single poll."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        mock_api_client.responses = {
+            f"{base_url}/item/{sample_item['id']}.json": sample_item,
+            **{f"{base_url}/item/{comment['id']}.json": comment for comment in sample_comments},
+        }
+        stream_client = MagicMock()
+        stream_client.iter_kid_ids.side_effect = requests.ConnectionError("no stream")
+
+        api = HackerNewsAPI(mock_context)
+        batches = list(api.stream_new_top_level_comments(sample_item["id"], stream_client))
+
+        assert [[comment.id for comment in batch] for batch in batches] == [[1001, 1002, 1003]]
+
+    def test_stream_closes_own_client(self, mock_context, mock_api_client, sample_item, sample_comments):
+        """Test that a stream client created by the generator is closed with it."""
+        base_url = "https://hacker-news.firebaseio.com/v0"
+        mock_api_client.responses = {
+            f"{base_url}/item/{comment['id']}.json": comment for comment in sample_comments
+        }
+
+        with patch("hn_watcher.hn.StreamingHNClient") as mock_stream_client:
+            stream_client = mock_stream_client.return_value
+            stream_client.iter_kid_ids.return_value = iter([[1001], [1002]])
+
+            api = HackerNewsAPI(mock_context)
+            batches = api.stream_new_top_level_comments(sample_item["id"])
+            assert [comment.id for comment in next(batches)] == [1001]
+            stream_client.close.assert_not_called()
+
+            # Abandoning the generator still closes the client
+            batches.close()
+            stream_client.close.assert_called_once()
+
+        # A client passed in by the caller is left open
+        caller_client = MagicMock()
+        caller_client.iter_kid_ids.return_value = iter([])
+        list(api.stream_new_top_level_comments(sample_item["id"], caller_client))
+        caller_client.close.assert_not_called()
+
+
+class TestAlgoliaHNClient:
+    """Tests for the AlgoliaHNClient class."""
+
+    def test_get_story_comments(self, mock_api_client):
+        """Test paging through search hits and mapping them to Firebase items."""
+        base_url = "https://hn.algolia.com/api/v1/search?tags=comment,story_12345&hitsPerPage=2"
+        mock_api_client.responses = {
+            f"{base_url}&page=0": {
+                "nbPages": 2,
+                "hits": [
+                    {"objectID": "1001", "author": "user1", "comment_text": "Comment 1",
+                     "parent_id": 12345, "story_id": 12345, "created_at_i": 1617235300},
+                    {"objectID": "2001", "author": "user3", "comment_text": "Reply",
+                     "parent_id": 1001, "story_id": 12345, "created_at_i": 1617235600},
+                ],
+            },
+            f"{base_url}&page=1": {
+                "nbPages": 2,
+                "hits": [
+                    {"objectID": "1002", "author": "user2", "comment_text": "Comment 2",
+                     "parent_id": 12345, "story_id": 12345, "created_at_i": 1617235400},
+                ],
+            },
+        }
+
+        client = AlgoliaHNClient(mock_api_client, hits_per_page=2)
+        comments = client.get_story_comments(12345)
+
+        assert len(mock_api_client.get_calls) == 2
+        assert [comment["id"] for comment in comments] == [1001, 2001, 1002]
+        assert comments[0] == {
+            "id": 1001,
+            "by": "user1",
+            "text": "Comment 1",
+            "parent": 12345,
+            "time": 1617235300,
+            "type": "comment",
+            "kids": [2001],
+        }
+        assert "kids" not in comments[2]
+
+
+class TestStreamingHNClient:
+    """Tests for the StreamingHNClient class."""
+
+    def test_iter_kid_ids(self):
+        """Test parsing Firebase put/patch events into kid ID updates."""
+        lines = [
+            "event: put",
+            "data: " + json.dumps({"path": "/", "data": {"id": 12345, "kids": [1001, 1002]}}),
+            "",
+            "event: keep-alive",
+            "data: null",
+            "",
+            "event: patch",
+            "data: " + json.dumps({"path": "/", "data": {"descendants": 3}}),
+            "",
+            "event: put",
+            "data: " + json.dumps({"path": "/kids/2", "data": 1003}),
+            "",
+        ]
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = iter(lines)
+        session = MagicMock()
+        session.get.return_value = response
+
+        client = StreamingHNClient(session=session)
+        assert list(client.iter_kid_ids(12345)) == [[1001, 1002], [1003]]
+
+        # The session belongs to the caller, so closing the client keeps it open
+        client.close()
+        session.close.assert_not_called()
+
+        url = session.get.call_args[0][0]
+        assert url == "https://hacker-news.firebaseio.com/v0/item/12345.json"
+        assert session.get.call_args[1]["headers"] == {"Accept": "text/event-stream"}
+
+
+class TestRequestsClient:
+    """Tests for the RequestsClient class."""
+
+    def test_get_reuses_session(self):
+        """Test that requests share one pooled session."""
+        client = RequestsClient()
+        response = MagicMock()
+        response.json.return_value = {"id": 1}
+
+        with patch.object(client._session, "get", return_value=response) as mock_get:
+            assert client.get("https://example.com/a.json") == {"id": 1}
+            assert client.get("https://example.com/b.json") == {"id": 1}
+
+        assert mock_get.call_count == 2
+        mock_get.assert_called_with("https://example.com/b.json", timeout=client.timeout)
+        response.raise_for_status.assert_called()
+        assert client._session.headers["User-Agent"] == "hn-watcher"
+
+        client.close()
+
+    def test_retries_rate_limited_responses(self):
+        """Test that 429 and 503 responses are retried with backoff."""
+        client = RequestsClient(max_retries=2, backoff_factor=0.1)
+
+        retry = client._session.get_adapter("https://example.com").max_retries
+        assert retry.total == 2
+        assert retry.backoff_factor == 0.1
+        assert set(retry.status_forcelist) == {429, 503}
+
+        client.close()
+
+
+class TestRateLimiter:
+    """Tests for the RateLimiter class."""
+
+    def test_allows_bursts_then_waits(self):
+        """Test that requests only wait once the bucket is empty."""
+        limiter = RateLimiter(rate=10, burst=3)
+
+        assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        # Later requests queue up behind each other at the refill rate
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+        assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_no_limit(self):
+        """Test that a rate of 0 disables limiting."""
+        limiter = RateLimiter(rate=0)
+        assert all(limiter.reserve() == 0.0 for _ in range(100))
@@ -0,0 +1,44 @@
+"""
+Tests for the models module.
+"""
+
+import pytest
+
+from hn_watcher.models import Comment, CommentBatch
+
+
+class TestComment:
+    """Tests for the Comment class."""
+
+    def test_from_api(self, sample_comments):
+        """Test building a comment from an API item with extra keys."""
+        comment = Comment.from_api({**sample_comments[0], "kids": [2001], "type": "comment"})
+
+        assert comment == Comment(id=1001, by="user1", time=1617235300, text="Comment 1")
+        assert comment.deleted is False
+        assert comment.dead is False
+
+    def test_slots(self):
+        """Test that comments don't carry a per-instance dict."""
+        comment = Comment(id=1001)
+
+        assert not hasattr(comment, "__dict__")
+        with pytest.raises(AttributeError):
+            comment.score = 1
+
+
+class TestCommentBatch:
+    """Tests for the CommentBatch class."""
+
+    def test_from_api(self, sample_comments):
+        """Test building columns from API items."""
+        sample_comments[1]["deleted"] = True
+        batch = CommentBatch.from_api(sample_comments)
+
+        assert len(batch) == 3
+        assert batch.ids == [1001, 1002, 1003]
+        assert batch.bys == ["user1", "user2", "user3"]
+        assert batch.deleted == [False, True, False]
+
+        # Iterating yields the same comments as building them one by one
+        assert list(batch) == [Comment.from_api(item) for item in sample_comments]
@@ -3,6 +3,7 @@ Tests for the publisher module.
 """
 
 import io
+import json
 from unittest.mock import MagicMock, patch
 
 import avro.io
@@ -11,9 +12,13 @@ import pika
 import pytest
 from pika.exchange_type import ExchangeType
 
-from hn_watcher.models import Comment
+from hn_watcher.models import Comment, CommentBatch
 from hn_watcher.publisher import PikaPublisher
 
+# Parsed independently of the publisher, and reused by every test
+_SCHEMA = avro.schema.parse(json.dumps(PikaPublisher.COMMENT_SCHEMA))
+_READER = avro.io.DatumReader(_SCHEMA)
+
 
 class TestPikaPublisher:
     """Tests for the PikaPublisher class."""
@@ -28,7 +33,33 @@ class TestPikaPublisher:
         assert publisher._connection is None
         assert publisher._channel is None
         assert publisher.avro_schema is not None
+
+        # The schema is parsed once and shared by all publishers
+        assert PikaPublisher().avro_schema is publisher.avro_schema
+        assert publisher.avro_schema == _SCHEMA
         
+    def test_custom_schema(self):
+        """Test that subclasses with their own schema parse it once and encode generically."""
+
+        class ScoredPublisher(PikaPublisher):
+            COMMENT_SCHEMA = {
+                **PikaPublisher.COMMENT_SCHEMA,
+                "fields": [
+                    *PikaPublisher.COMMENT_SCHEMA["fields"],
+                    {"name": "score", "type": ["null", "int"], "default": None},
+                ],
+            }
+
+        publisher = ScoredPublisher()
+        assert ScoredPublisher().avro_schema is publisher.avro_schema
+        assert publisher.avro_schema != PikaPublisher().avro_schema
+        assert publisher.generic_encoder is True
+
+        body = publisher.encode_comment(Comment(id=1001, text="Test comment"))
+        result = avro.io.DatumReader(publisher.avro_schema).read(avro.io.BinaryDecoder(io.BytesIO(body)))
+        assert result["id"] == 1001
+        assert result["score"] is None
+
     def test_is_connected_property(self):
         """Test the is_connected property."""
         publisher = PikaPublisher()
@@ -114,9 +145,25 @@ class TestPikaPublisher:
             assert publisher._connection is None
             assert publisher._channel is None
     
+    def test_confirm_delivery(self):
+        """Test that publisher confirms are only enabled when requested."""
+        with patch("pika.BlockingConnection") as mock_connection_class:
+            mock_connection = MagicMock()
+            mock_channel = MagicMock()
+            mock_connection.channel.return_value = mock_channel
+            mock_connection.is_closed = False
+            mock_channel.is_closed = False
+            mock_connection_class.return_value = mock_connection
+
+            with PikaPublisher().connection():
+                mock_channel.confirm_delivery.assert_not_called()
+
+            with PikaPublisher(confirm_delivery=True).connection():
+                mock_channel.confirm_delivery.assert_called_once()
+
     def test_publish_comment(self):
         """Test publishing a comment."""
-        # Create a sample comment using the Pydantic model
+        # Create a sample comment
         comment = Comment(
             id=1001,
             parent_id=12345,
@@ -144,7 +191,7 @@ class TestPikaPublisher:
             # Get the call arguments
             call_args = mock_channel.basic_publish.call_args[1]
             assert call_args["exchange"] == publisher.exchange
-            assert call_args["routing_key"] == "comment.new"
+            assert call_args["routing_key"] == b"comment.new"  # Encoded once, up front
             
             # Verify properties
             properties = call_args["properties"]
@@ -155,8 +202,7 @@ class TestPikaPublisher:
             body = call_args["body"]
             buf = io.BytesIO(body)
             decoder = avro.io.BinaryDecoder(buf)
-            reader = avro.io.DatumReader(publisher.avro_schema)
-            result = reader.read(decoder)
+            result = _READER.read(decoder)
             
             assert result["id"] == comment.id
             assert result["parent_id"] == comment.parent_id
@@ -166,6 +212,138 @@ class TestPikaPublisher:
             assert result["deleted"] is False
             assert result["dead"] is False
     
+    def test_publish_comment_reuses_buffer(self):
+        """Test that each message only contains its own comment."""
+        with patch("pika.BlockingConnection") as mock_connection_class:
+            mock_connection = MagicMock()
+            mock_channel = MagicMock()
+            mock_connection.channel.return_value = mock_channel
+            mock_connection.is_closed = False
+            mock_channel.is_closed = False
+            mock_connection_class.return_value = mock_connection
+
+            publisher = PikaPublisher()
+            publisher.publish_comment(Comment(id=1001, text="A much longer first comment"))
+            publisher.publish_comment(Comment(id=1002, text="Short"))
+
+            bodies = [call[1]["body"] for call in mock_channel.basic_publish.call_args_list]
+            results = [_READER.read(avro.io.BinaryDecoder(io.BytesIO(body))) for body in bodies]
+
+            assert [result["id"] for result in results] == [1001, 1002]
+            assert results[1]["text"] == "Short"
+            assert len(bodies[1]) < len(bodies[0])
+
+    def test_publish_comments(self):
+        """Test publishing a batch of comments on one channel."""
+        comments = [Comment(id=1001, text="First"), Comment(id=1002, text="Second")]
+
+        with patch("pika.BlockingConnection") as mock_connection_class:
+            mock_connection = MagicMock()
+            mock_channel = MagicMock()
+            mock_connection.channel.return_value = mock_channel
+            mock_connection.is_closed = False
+            mock_channel.is_closed = False
+            mock_connection_class.return_value = mock_connection
+
+            publisher = PikaPublisher()
+            publisher.publish_comments(comments, "comment.item.12345")
+
+            mock_connection_class.assert_called_once()
+            assert mock_channel.basic_publish.call_count == 2
+            calls = [call[1] for call in mock_channel.basic_publish.call_args_list]
+            assert all(call["routing_key"] == b"comment.item.12345" for call in calls)
+            assert [call["body"] for call in calls] == [
+                publisher.encode_comment(comment) for comment in comments
+            ]
+
+            # An empty batch doesn't publish anything
+            mock_channel.basic_publish.reset_mock()
+            publisher.publish_comments([], "comment.item.12345")
+            mock_channel.basic_publish.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "comment",
+        [
+            Comment(id=1001),
+            Comment(id=1001, parent_id=12345, by="testuser", time=1617235300, text="Test comment"),
+            Comment(id=1001, text="Ünïcödé ✓", deleted=True, dead=None),
+            Comment(id=2**30, parent_id=0, by="", time=-1, text="", deleted=None, dead=True),
+        ],
+    )
+    def test_encode_comment_matches_generic_writer(self, comment):
+        """Test that the specialized encoder matches Avro's generic DatumWriter."""
+        specialized = PikaPublisher().encode_comment(comment)
+        generic = PikaPublisher(generic_encoder=True).encode_comment(comment)
+        assert specialized == generic
+
+    def test_publish_raw_batch(self):
+        """Test publishing pre-encoded messages with their own routing keys."""
+        with patch("pika.BlockingConnection") as mock_connection_class:
+            mock_connection = MagicMock()
+            mock_channel = MagicMock()
+            mock_connection.channel.return_value = mock_channel
+            mock_connection.is_closed = False
+            mock_channel.is_closed = False
+            mock_connection_class.return_value = mock_connection
+
+            publisher = PikaPublisher()
+            payloads = [
+                ("comment.item.1", publisher.encode_comment(Comment(id=1001))),
+                ("comment.item.2", publisher.encode_comment(Comment(id=1002))),
+            ]
+            publisher.publish_raw_batch(iter(payloads))
+
+            calls = [call[1] for call in mock_channel.basic_publish.call_args_list]
+            assert [(call["routing_key"], call["body"]) for call in calls] == payloads
+
+    def test_publish_transient(self):
+        """Test that transient publishers don't ask for persistent messages."""
+        with patch("pika.BlockingConnection") as mock_connection_class:
+            mock_connection = MagicMock()
+            mock_channel = MagicMock()
+            mock_connection.channel.return_value = mock_channel
+            mock_connection.is_closed = False
+            mock_channel.is_closed = False
+            mock_connection_class.return_value = mock_connection
+
+            PikaPublisher(transient=True).publish_comment(Comment(id=1001))
+
+            properties = mock_channel.basic_publish.call_args[1]["properties"]
+            assert properties.delivery_mode == 1  # Transient
+
+    def test_publish_keeps_connection_open(self):
+        """Test that consecutive publishes reuse one connection."""
+        with patch("pika.BlockingConnection") as mock_connection_class:
+            mock_connection = MagicMock()
+            mock_channel = MagicMock()
+            mock_connection.channel.return_value = mock_channel
+            mock_connection.is_closed = False
+            mock_channel.is_closed = False
+            mock_connection_class.return_value = mock_connection
+
+            publisher = PikaPublisher(heartbeat=30)
+            publisher.publish_comment(Comment(id=1001))
+            publisher.publish_comment(Comment(id=1002))
+
+            mock_connection_class.assert_called_once()
+            parameters = mock_connection_class.call_args[0][0]
+            assert parameters.heartbeat == 30
+            assert mock_channel.basic_publish.call_count == 2
+
+            # Errors close the connection so the next publish reconnects
+            mock_channel.basic_publish.side_effect = Exception("Test error")
+            with pytest.raises(Exception, match="Test error"):
+                publisher.publish_comment(Comment(id=1003))
+            assert publisher._connection is None
+
+    def test_encode_batch(self, sample_comments):
+        """Test that encoding a batch matches encoding its comments one by one."""
+        batch = CommentBatch.from_api(sample_comments)
+        expected = [PikaPublisher().encode_comment(comment) for comment in batch]
+
+        assert PikaPublisher().encode_batch(batch) == expected
+        assert PikaPublisher(generic_encoder=True).encode_batch(batch) == expected
+
     def test_close(self):
         """Test closing the connection."""
         publisher = PikaPublisher()
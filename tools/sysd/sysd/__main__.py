@@ -4,13 +4,13 @@ Systemd Service Manager CLI
 Usage: python -m sysd <command> [args...]
 """
 
-import fire
-
 from .manager import SystemdManager
 
 
 def main():
     """Main CLI interface for systemd service management."""
+    import fire
+
     manager = SystemdManager()
 
     # Create a custom Fire class with better help
@@ -44,19 +44,7 @@ def main():
                 sysd add backup "backup.sh" --schedule="daily" --description="Daily backup"
                 sysd add startup-task "init.py" --schedule="@startup"
             """
-            environment = None
-            if env:
-                try:
-                    import json
-
-                    environment = json.loads(env)
-                except json.JSONDecodeError:
-                    # Parse KEY=VALUE,KEY2=VALUE2 format
-                    environment = {}
-                    for pair in env.split(","):
-                        if "=" in pair:
-                            key, value = pair.split("=", 1)
-                            environment[key.strip()] = value.strip()
+            environment = SystemdManager._parse_env(env)
 
             data_dir_list = (
                 [d.strip() for d in data_dirs.split(",") if d.strip()]
@@ -124,17 +112,7 @@ def main():
             if description:
                 kwargs["description"] = description
             if env:
-                try:
-                    import json
-
-                    kwargs["environment"] = json.loads(env)
-                except json.JSONDecodeError:
-                    environment = {}
-                    for pair in env.split(","):
-                        if "=" in pair:
-                            key, value = pair.split("=", 1)
-                            environment[key.strip()] = value.strip()
-                    kwargs["environment"] = environment
+                kwargs["environment"] = SystemdManager._parse_env(env)
 
             manager.update(name, **kwargs)
 
@@ -252,7 +230,10 @@ For more details on systemd timer calendar format:
             print(help_text)
 
     # Initialize Fire with the CLI class
-    fire.Fire(SysdCLI)
+    try:
+        fire.Fire(SysdCLI)
+    finally:
+        manager.close()
 
 
 if __name__ == "__main__":
@@ -3,31 +3,153 @@
 Systemd Service Manager - Clean abstractions for managing systemd services and timers.
 """
 
+import functools
 import getpass
 import json
 import os
+import re
+import shlex
 import shutil
 import subprocess
-import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from jinja2 import Environment, FileSystemLoader
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+# Marks the end of each command's output on the persistent sudo shell
+_END_MARKER = "__SYSD_END__"
+
+# Runs a full `sudo systemctl ...` argv and returns its result
+SystemctlRunner = Callable[[List[str]], subprocess.CompletedProcess]
+
+# Characters that are not allowed in service names
+_INVALID_NAME_RE = re.compile(r"[\s/\\:*?<>|]")
+
+
+@functools.lru_cache(maxsize=32)
+def _is_uv_project(working_dir: Path, uv_path: Optional[str]) -> bool:
+    """Detect if a directory is a uv project, given the uv executable path."""
+    return uv_path is not None and (working_dir / "pyproject.toml").exists()
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_schedule(schedule: str) -> Tuple[str, str]:
+    """Parse schedule string into systemd timer format, caching the result."""
+    schedule = schedule.lower().strip()
+
+    # Handle common shortcuts
+    shortcuts = {
+        "hourly": ("calendar", "hourly"),
+        "daily": ("calendar", "daily"),
+        "weekly": ("calendar", "weekly"),
+        "monthly": ("calendar", "monthly"),
+    }
+
+    if schedule in shortcuts:
+        return shortcuts[schedule]
+
+    # Handle startup/boot
+    if schedule.startswith("@startup"):
+        delay = schedule.split("=")[1] if "=" in schedule else "1min"
+        return ("startup", delay)
+
+    if schedule.startswith("@boot"):
+        delay = schedule.split("=")[1] if "=" in schedule else "1min"
+        return ("boot", delay)
+
+    # Handle cron-like syntax (convert to OnCalendar)
+    if schedule.startswith("*/"):
+        minutes = schedule[2:]
+        return ("calendar", f"*:0/{minutes}")
+
+    # Assume it's a direct OnCalendar specification
+    return ("calendar", schedule)
 
 
 class SystemdManager:
     """Manages systemd services and timers with clean abstractions."""
 
-    def __init__(self, service_prefix: str = "sysd"):
+    def __init__(
+        self,
+        service_prefix: str = "sysd",
+        systemd_dir: Optional[Union[str, Path]] = None,
+        systemctl_runner: Optional[SystemctlRunner] = None,
+    ):
         self.service_prefix = service_prefix
-        self.systemd_dir = Path("/etc/systemd/system")
+        self.systemd_dir = Path(systemd_dir or "/etc/systemd/system")
         self.templates_dir = Path(__file__).parent / "templates"
         self.config_dir = Path.home() / ".config" / "sysd"
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.services_file = self.config_dir / "services.json"
 
-        # Setup Jinja2 environment
-        self.jinja_env = Environment(loader=FileSystemLoader(str(self.templates_dir)))
+        # Long-lived `sudo sh` used for systemctl, started on first use
+        self._sudo_shell: Optional[subprocess.Popen] = None
+        self._systemctl_prefix = ("sudo", "systemctl")
+        self._systemctl_runner = systemctl_runner or self._run_in_sudo_shell
+
+        # Timers waiting to be enabled while inside batch()
+        self._batch_pending_enables: Optional[List[str]] = None
+
+    def __enter__(self) -> "SystemdManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the persistent sudo shell, if one is running."""
+        shell = getattr(self, "_sudo_shell", None)
+        if shell is None:
+            return
+        self._sudo_shell = None
+        if shell.poll() is None:
+            try:
+                shell.communicate("exit\n", timeout=5)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                shell.kill()
+
+    @functools.cached_property
+    def jinja_env(self) -> "Environment":
+        """Jinja2 environment for the unit templates, created on first use."""
+        # Imported here so commands that never render units skip the import cost
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+        # Reuse compiled templates across processes. The default cache directory
+        # is private to the current user, unlike a fixed path under /tmp.
+        return Environment(
+            loader=FileSystemLoader(str(self.templates_dir)),
+            bytecode_cache=FileSystemBytecodeCache(),
+        )
+
+    @functools.cached_property
+    def _service_template(self) -> "Template":
+        """Compiled service unit template, loaded once per manager."""
+        return self.jinja_env.get_template("service.j2")
+
+    @functools.cached_property
+    def _timer_template(self) -> "Template":
+        """Compiled timer unit template, loaded once per manager."""
+        return self.jinja_env.get_template("timer.j2")
 
     def _get_service_name(self, name: str) -> str:
         """Get the full systemd service name."""
@@ -39,84 +161,232 @@ class SystemdManager:
 
     def _load_services(self) -> Dict[str, Dict[str, Any]]:
         """Load services configuration from file."""
-        if not self.services_file.exists():
+        try:
+            data = self.services_file.read_bytes()
+        except FileNotFoundError:
             return {}
         try:
-            with open(self.services_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            services: Dict[str, Dict[str, Any]] = (
+                orjson.loads(data) if orjson is not None else json.loads(data)
+            )
+        except json.JSONDecodeError:
             return {}
+        return services
 
     def _save_services(self, services: Dict[str, Dict[str, Any]]) -> None:
-        """Save services configuration to file."""
-        with open(self.services_file, "w") as f:
-            json.dump(services, f, indent=2)
+        """Save services configuration to file atomically."""
+        if orjson is not None:
+            data = orjson.dumps(services, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(services, indent=2).encode()
+
+        # Write alongside and rename so a crash never leaves a partial file
+        tmp_file = self.services_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, self.services_file)
 
     def _parse_schedule(self, schedule: str) -> Tuple[str, str]:
         """Parse schedule string into systemd timer format."""
-        schedule = schedule.lower().strip()
-
-        # Handle common shortcuts
-        shortcuts = {
-            "hourly": ("calendar", "hourly"),
-            "daily": ("calendar", "daily"),
-            "weekly": ("calendar", "weekly"),
-            "monthly": ("calendar", "monthly"),
-        }
-
-        if schedule in shortcuts:
-            return shortcuts[schedule]
-
-        # Handle startup/boot
-        if schedule.startswith("@startup"):
-            delay = schedule.split("=")[1] if "=" in schedule else "1min"
-            return ("startup", delay)
-
-        if schedule.startswith("@boot"):
-            delay = schedule.split("=")[1] if "=" in schedule else "1min"
-            return ("boot", delay)
+        return _parse_schedule(schedule)
 
-        # Handle cron-like syntax (convert to OnCalendar)
-        if schedule.startswith("*/"):
-            minutes = schedule[2:]
-            return ("calendar", f"*:0/{minutes}")
-
-        # Assume it's a direct OnCalendar specification
-        return ("calendar", schedule)
+    @functools.cached_property
+    def _uv_path(self) -> Optional[str]:
+        """Absolute path to the uv executable, looked up once."""
+        return shutil.which("uv")
 
     def _detect_uv_project(self, working_dir: Path) -> bool:
         """Detect if this is a uv project."""
-        return (working_dir / "pyproject.toml").exists() and shutil.which(
-            "uv"
-        ) is not None
+        return _is_uv_project(working_dir, self._uv_path)
 
-    def _build_command(self, command: str, working_dir) -> str:
+    def _build_command(self, command: str, working_dir: Union[str, Path]) -> str:
         """Build the full command with uv if needed."""
-        working_path = Path(working_dir)
-        if self._detect_uv_project(working_path):
-            if not command.startswith("uv "):
-                # Wrap in uv run if not already
-                if command.startswith("python "):
-                    command = command.replace("python ", "uv run python ", 1)
-                elif " -m " in command:
-                    command = f"uv run {command}"
-                else:
-                    command = f"uv run {command}"
+        uv_path = self._uv_path
+        try:
+            argv = shlex.split(command)
+        except ValueError:
+            # Unbalanced quotes can't be split, so prefix the raw string instead
+            program = command.split(maxsplit=1)[0]
+            if program not in ("uv", uv_path) and self._detect_uv_project(
+                Path(working_dir)
+            ):
+                command, program = f"uv run {command}", "uv"
+            if program == "uv" and uv_path:
+                command = command.replace("uv", uv_path, 1)
+            return command
+        if not argv:
+            return command
+
+        rewritten = False
+
+        # Wrap in uv run if this is a uv project and it isn't already
+        if argv[0] not in ("uv", uv_path) and self._detect_uv_project(
+            Path(working_dir)
+        ):
+            argv = ["uv", "run", *argv]
+            rewritten = True
 
         # Ensure absolute path for uv
-        if command.startswith("uv "):
-            uv_path = shutil.which("uv")
-            if uv_path:
-                command = command.replace("uv ", f"{uv_path} ", 1)
-
-        return command
+        if argv[0] == "uv" and uv_path:
+            argv[0] = uv_path
+            rewritten = True
+
+        # Leave commands we didn't touch exactly as the user quoted them
+        return shlex.join(argv) if rewritten else command
+
+    def _get_sudo_shell(self) -> subprocess.Popen:
+        """Get the persistent sudo shell, starting it if needed."""
+        if self._sudo_shell is None or self._sudo_shell.poll() is not None:
+            self._sudo_shell = subprocess.Popen(
+                ["sudo", "sh"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        return self._sudo_shell
+
+    @staticmethod
+    def _read_until_marker(stream: Any) -> Tuple[str, Optional[str]]:
+        """Read a stream up to the end marker, returning output and marker value."""
+        chunks: List[str] = []
+        for line in stream:
+            if line.startswith(_END_MARKER):
+                # Drop the newline written before the marker
+                output = "".join(chunks)[:-1]
+                return output, line[len(_END_MARKER) :].strip(":\n")
+            chunks.append(line)
+        raise OSError("sudo shell exited unexpectedly")
 
     def _run_systemctl(
         self, command: List[str], check: bool = True
     ) -> subprocess.CompletedProcess:
         """Run systemctl command with sudo."""
-        cmd = ["sudo", "systemctl"] + command
-        return subprocess.run(cmd, capture_output=True, text=True, check=check)
+        result = self._systemctl_runner([*self._systemctl_prefix, *command])
+        if check:
+            result.check_returncode()
+        return result
+
+    def _run_in_sudo_shell(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        """Run a `sudo ...` argv through the persistent sudo shell."""
+        return self._run_sudo_script(shlex.join(cmd[1:]), cmd)
+
+    def _run_sudo_script(
+        self, script: str, args: Union[str, List[str]]
+    ) -> subprocess.CompletedProcess:
+        """Run a shell command line through the persistent sudo shell."""
+        shell = self._get_sudo_shell()
+        assert shell.stdin is not None and shell.stdout is not None
+        assert shell.stderr is not None
+
+        try:
+            # stderr goes to a temp file and is replayed after the stdout marker,
+            # so a command can't fill the stderr pipe while we read stdout
+            shell.stdin.write(
+                f'err=$(mktemp); {script} </dev/null 2>"$err"; rc=$?; '
+                f"printf '\\n{_END_MARKER}:%d\\n' \"$rc\"; "
+                f'cat "$err" >&2; rm -f "$err"; '
+                f"printf '\\n{_END_MARKER}\\n' >&2\n"
+            )
+            shell.stdin.flush()
+
+            stdout, returncode = self._read_until_marker(shell.stdout)
+            stderr, _ = self._read_until_marker(shell.stderr)
+        except OSError:
+            # The shell died, e.g. sudo refused the password; report it as a
+            # failed command so callers' CalledProcessError handling applies
+            self._sudo_shell = None
+            try:
+                _, stderr = shell.communicate(timeout=5)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                shell.kill()
+                stderr = ""
+            return subprocess.CompletedProcess(
+                args,
+                shell.returncode or 1,
+                "",
+                stderr or "sudo shell exited unexpectedly",
+            )
+        return subprocess.CompletedProcess(args, int(returncode or 0), stdout, stderr)
+
+    def _render_service(
+        self,
+        service_name: str,
+        description: str,
+        command: str,
+        working_dir: Path,
+        environment: Optional[Dict[str, str]],
+        data_dirs: Optional[List[str]],
+    ) -> str:
+        """Render the service unit file."""
+        context = {
+            "name": service_name,
+            "description": description,
+            "user": getpass.getuser(),
+            "group": getpass.getuser(),
+            "working_dir": str(working_dir),
+            "command": self._build_command(command, working_dir),
+            "environment": environment or {},
+            "data_dirs": data_dirs or [],
+            "dependencies": [],
+        }
+        return self._service_template.render(**context)
+
+    def _render_timer(self, service_name: str, description: str, schedule: str) -> str:
+        """Render the timer unit file."""
+        schedule_type, schedule_value = self._parse_schedule(schedule)
+        timer_context = {
+            "description": description,
+            "service_name": service_name,
+            "schedule_type": schedule_type,
+            "schedule": schedule_value,
+        }
+        return self._timer_template.render(**timer_context)
+
+    def _write_unit_file(self, path: Path, content: str) -> None:
+        """Write a unit file into the systemd directory, using sudo if needed."""
+        if os.access(path.parent, os.W_OK):
+            path.write_text(content)
+            return
+        # printf is a shell builtin, so the content isn't limited by ARG_MAX
+        self._run_sudo_script(
+            f"printf '%s' {shlex.quote(content)} > {shlex.quote(str(path))}",
+            f"write {path}",
+        ).check_returncode()
+
+    def _remove_unit_file(self, path: Path) -> None:
+        """Remove a unit file from the systemd directory, using sudo if needed."""
+        if os.access(path.parent, os.W_OK):
+            path.unlink(missing_ok=True)
+            return
+        cmd = ["sudo", "rm", "-f", str(path)]
+        self._run_in_sudo_shell(cmd).check_returncode()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defer daemon-reload and timer enables until the block exits.
+
+        Every add() and remove() inside the block shares one daemon-reload and
+        one bulk `enable --now` for all added timers. Nested calls join the
+        outermost batch.
+        """
+        if self._batch_pending_enables is not None:
+            yield
+            return
+
+        self._batch_pending_enables = []
+        try:
+            yield
+        except BaseException:
+            # Still pick up whatever unit files were changed before the failure
+            self._batch_pending_enables = None
+            self._run_systemctl(["daemon-reload"], check=False)
+            raise
+
+        pending, self._batch_pending_enables = self._batch_pending_enables, None
+        self._run_systemctl(["daemon-reload"])
+        if pending:
+            self._run_systemctl(["enable", "--now", *pending])
 
     def add(
         self,
@@ -143,75 +413,32 @@ class SystemdManager:
         if not description:
             description = f"Managed service: {name}"
 
-        working_dir = Path(working_dir or os.getcwd()).absolute()
-        full_command = self._build_command(command, working_dir)
-        schedule_type, schedule_value = self._parse_schedule(schedule)
+        working_path = Path(working_dir or os.getcwd()).absolute()
 
         service_name = self._get_service_name(name)
         timer_name = self._get_timer_name(name)
 
-        # Prepare template context
-        context = {
-            "name": service_name,
-            "description": description,
-            "user": getpass.getuser(),
-            "group": getpass.getuser(),
-            "working_dir": str(working_dir),
-            "command": full_command,
-            "environment": environment or {},
-            "data_dirs": data_dirs or [],
-            "dependencies": [],
-        }
-
-        timer_context = {
-            "description": description,
-            "service_name": service_name,
-            "schedule_type": schedule_type,
-            "schedule": schedule_value,
-        }
-
         # Render templates
-        service_template = self.jinja_env.get_template("service.j2")
-        timer_template = self.jinja_env.get_template("timer.j2")
-
-        service_content = service_template.render(**context)
-        timer_content = timer_template.render(**timer_context)
+        service_content = self._render_service(
+            service_name, description, command, working_path, environment, data_dirs
+        )
+        timer_content = self._render_timer(service_name, description, schedule)
 
         # Write service files
         service_file = self.systemd_dir / f"{service_name}.service"
         timer_file = self.systemd_dir / f"{timer_name}.timer"
 
         try:
-            # Write files with sudo using a temporary file approach
-
-            # Write service file
-            with tempfile.NamedTemporaryFile(
-                mode="w", delete=False, suffix=".service"
-            ) as f:
-                f.write(service_content)
-                temp_service = f.name
-
-            # Write timer file
-            with tempfile.NamedTemporaryFile(
-                mode="w", delete=False, suffix=".timer"
-            ) as f:
-                f.write(timer_content)
-                temp_timer = f.name
+            # Pipe the rendered units straight into place with sudo
+            self._write_unit_file(service_file, service_content)
+            self._write_unit_file(timer_file, timer_content)
 
-            try:
-                # Copy files to systemd directory
-                subprocess.run(
-                    ["sudo", "cp", temp_service, str(service_file)], check=True
-                )
-                subprocess.run(["sudo", "cp", temp_timer, str(timer_file)], check=True)
-            finally:
-                # Clean up temp files
-                os.unlink(temp_service)
-                os.unlink(temp_timer)
-
-            # Reload systemd and enable timer
-            self._run_systemctl(["daemon-reload"])
-            self._run_systemctl(["enable", "--now", f"{timer_name}.timer"])
+            # Reload systemd and enable timer, or leave it to batch()
+            if self._batch_pending_enables is not None:
+                self._batch_pending_enables.append(f"{timer_name}.timer")
+            else:
+                self._run_systemctl(["daemon-reload"])
+                self._run_systemctl(["enable", "--now", f"{timer_name}.timer"])
 
             # Save service configuration
             services = self._load_services()
@@ -219,7 +446,7 @@ class SystemdManager:
                 "command": command,
                 "schedule": schedule,
                 "description": description,
-                "working_dir": str(working_dir),
+                "working_dir": str(working_path),
                 "environment": environment or {},
                 "data_dirs": data_dirs or [],
                 "service_name": service_name,
@@ -253,11 +480,12 @@ class SystemdManager:
             service_file = self.systemd_dir / f"{service_name}.service"
             timer_file = self.systemd_dir / f"{timer_name}.timer"
 
-            subprocess.run(["sudo", "rm", "-f", str(service_file)], check=True)
-            subprocess.run(["sudo", "rm", "-f", str(timer_file)], check=True)
+            self._remove_unit_file(service_file)
+            self._remove_unit_file(timer_file)
 
-            # Reload systemd
-            self._run_systemctl(["daemon-reload"])
+            # Reload systemd, unless batch() will do it
+            if self._batch_pending_enables is None:
+                self._run_systemctl(["daemon-reload"])
 
             # Remove from config
             del services[name]
@@ -285,27 +513,63 @@ class SystemdManager:
 
         service = services[name]
 
-        # Update values
-        if command is not None:
-            service["command"] = command
-        if schedule is not None:
-            service["schedule"] = schedule
-        if description is not None:
-            service["description"] = description
-        if environment is not None:
-            service["environment"] = environment
-
-        # Remove and re-add
-        self.remove(name)
-        self.add(
-            name=name,
-            command=service["command"],
-            schedule=service["schedule"],
-            description=service["description"],
-            working_dir=service["working_dir"],
-            environment=service["environment"],
-            data_dirs=service["data_dirs"],
+        # Work out which unit files the changes touch
+        changes = {
+            key: value
+            for key, value in (
+                ("command", command),
+                ("schedule", schedule),
+                ("description", description),
+                ("environment", environment),
+            )
+            if value is not None and value != service[key]
+        }
+        if not changes:
+            print(f"✓ Service '{name}' is already up to date")
+            return
+
+        service.update(changes)
+        service_changed = bool(
+            changes.keys() & {"command", "description", "environment"}
         )
+        timer_changed = bool(changes.keys() & {"schedule", "description"})
+
+        service_name = service["service_name"]
+        timer_name = service["timer_name"]
+
+        try:
+            # Rewrite only the affected unit files in place
+            if service_changed:
+                self._write_unit_file(
+                    self.systemd_dir / f"{service_name}.service",
+                    self._render_service(
+                        service_name,
+                        service["description"],
+                        service["command"],
+                        Path(service["working_dir"]),
+                        service["environment"],
+                        service["data_dirs"],
+                    ),
+                )
+            if timer_changed:
+                self._write_unit_file(
+                    self.systemd_dir / timer_name,
+                    self._render_timer(
+                        service_name, service["description"], service["schedule"]
+                    ),
+                )
+
+            if service_changed or timer_changed:
+                self._run_systemctl(["daemon-reload"])
+            if timer_changed:
+                # Re-arm the timer so a new schedule takes effect now
+                self._run_systemctl(["restart", timer_name])
+
+            self._save_services(services)
+
+        except subprocess.CalledProcessError as e:
+            print(f"✗ Failed to update service: {e}")
+            raise
 
         print(f"✓ Updated service '{name}'")
 
@@ -319,29 +583,31 @@ class SystemdManager:
         print("Managed Services:")
         print("-" * 80)
 
-        for name, config in services.items():
-            service_name = config["service_name"]
-            timer_name = config["timer_name"]
-
-            # Get status
-            try:
-                timer_result = self._run_systemctl(
-                    ["is-active", timer_name], check=False
-                )
-                timer_status = timer_result.stdout.strip()
-
-                service_result = self._run_systemctl(
-                    ["is-failed", f"{service_name}.service"], check=False
-                )
-                service_failed = service_result.returncode == 0
+        # Query every unit in one systemctl call each; systemctl prints one
+        # status per line in the order the units were given.
+        timers = [config["timer_name"] for config in services.values()]
+        units = [f"{config['service_name']}.service" for config in services.values()]
+        try:
+            timer_statuses = self._run_systemctl(
+                ["is-active", *timers], check=False
+            ).stdout.splitlines()
+            service_statuses = self._run_systemctl(
+                ["is-failed", *units], check=False
+            ).stdout.splitlines()
+        except Exception:
+            timer_statuses = service_statuses = []
+
+        for i, (name, config) in enumerate(services.items()):
+            if i < len(timer_statuses) and i < len(service_statuses):
+                timer_status = timer_statuses[i].strip()
+                service_failed = service_statuses[i].strip() == "failed"
 
                 status_icon = (
                     "✗"
                     if service_failed
                     else ("✓" if timer_status == "active" else "○")
                 )
-
-            except Exception:
+            else:
                 status_icon = "?"
                 timer_status = "unknown"
 
@@ -389,23 +655,21 @@ class SystemdManager:
         services = self._load_services()
 
         if all_services:
-            # Show logs for all services
-            identifiers = [
-                f"--identifier={svc['service_name']}" for svc in services.values()
-            ]
-            if not identifiers:
+            if not services:
                 print("No services to show logs for")
                 return
+            # One unit glob lets journald match every service from its index
+            unit_args = ["-u", f"{self.service_prefix}-*.service"]
         elif name:
             if name not in services:
                 print(f"✗ Service '{name}' not found")
                 return
-            identifiers = [f"--identifier={services[name]['service_name']}"]
+            unit_args = ["-u", f"{services[name]['service_name']}.service"]
         else:
             print("Must specify service name or use --all")
             return
 
-        cmd = ["journalctl"] + identifiers + [f"--lines={lines}"]
+        cmd = ["journalctl", *unit_args, f"--lines={lines}"]
         if follow:
             cmd.append("--follow")
 
@@ -416,19 +680,28 @@ class SystemdManager:
         except subprocess.CalledProcessError as e:
             print(f"✗ Failed to show logs: {e}")
 
+    @staticmethod
+    def _parse_env(env: str) -> Optional[Dict[str, str]]:
+        """Parse environment variables from JSON or KEY=VALUE,KEY2=VALUE2."""
+        if not env:
+            return None
+        try:
+            environment: Dict[str, str] = json.loads(env)
+            return environment
+        except json.JSONDecodeError:
+            pass
+        return {
+            key.strip(): value.strip()
+            for key, value in (
+                pair.split("=", 1) for pair in env.split(",") if "=" in pair
+            )
+        }
+
     def _validate_service_name(self, name: str) -> None:
         """Validate service name."""
         if not name:
             raise ValueError("Service name cannot be empty")
 
-        if " " in name:
-            raise ValueError("Service name cannot contain spaces")
-
-        if "/" in name:
-            raise ValueError("Service name cannot contain forward slashes")
-
-        # Check for other invalid characters
-        invalid_chars = ["\\", ":", "*", "?", "<", ">", "|"]
-        for char in invalid_chars:
-            if char in name:
-                raise ValueError(f"Service name cannot contain '{char}'")
+        match = _INVALID_NAME_RE.search(name)
+        if match:
+            raise ValueError(f"Service name cannot contain {match.group(0)!r}")
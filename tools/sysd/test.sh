@@ -24,12 +24,12 @@ pip install -e ".[dev]"
 
 # Run unit tests
 echo "Running unit tests..."
-pytest tests/test_unit.py -v
+pytest tests/test_unit.py -v -n auto --dist=loadscope
 
 # Run integration tests if Docker is available
 if command -v docker &> /dev/null; then
     echo "Running integration tests..."
-    pytest tests/test_integration.py -v --tb=short
+    pytest -m integration -v --tb=short -n auto --dist=loadfile
 else
     echo "Docker not available, skipping integration tests"
 fi
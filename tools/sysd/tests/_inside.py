@@ -0,0 +1,90 @@
+"""Checks that test_integration.py runs inside the sysd test container.
+
+These drive SystemdManager in-process against the container's real systemd,
+so each integration test costs a single docker exec instead of one per step.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from sysd.manager import SystemdManager
+
+SYSTEMD_DIR = Path("/etc/systemd/system")
+
+
+@pytest.fixture
+def manager():
+    """Get a manager for the container's systemd."""
+    with SystemdManager() as manager:
+        yield manager
+
+
+def test_lifecycle(manager, capsys):
+    """Complete service lifecycle: add, list, status, remove."""
+    # Add a service
+    manager.add(
+        name="test-service",
+        command="echo hello world",
+        schedule="*/15",
+        description="Test Service",
+    )
+    assert "Added service 'test-service'" in capsys.readouterr().out
+
+    # List services
+    manager.list_services()
+    output = capsys.readouterr().out
+    assert "test-service" in output
+    assert "*/15" in output
+
+    # Check service status
+    manager.status("test-service")
+    assert "test-service" in capsys.readouterr().out
+
+    # Verify systemd files exist
+    assert (SYSTEMD_DIR / "sysd-test-service.service").exists()
+    assert (SYSTEMD_DIR / "sysd-test-service.timer").exists()
+
+    # Remove service
+    manager.remove("test-service")
+    assert "Removed service 'test-service'" in capsys.readouterr().out
+
+    # Verify files are removed
+    assert list(SYSTEMD_DIR.glob("*test-service*")) == []
+
+    # List should be empty
+    manager.list_services()
+    assert "No managed services found" in capsys.readouterr().out
+
+
+def test_file_generation(manager):
+    """Generated systemd files have the expected content."""
+    manager.add(
+        name="file-test",
+        command="python -m test",
+        schedule="hourly",
+        description="File Test Service",
+    )
+
+    # Check service file content
+    content = (SYSTEMD_DIR / "sysd-file-test.service").read_text()
+    assert "[Unit]" in content
+    assert "Description=File Test Service" in content
+    assert "[Service]" in content
+    assert "Type=oneshot" in content
+    assert "User=testuser" in content
+    assert "WorkingDirectory=/home/testuser/sysd" in content
+    assert "StandardOutput=journal" in content
+    assert "NoNewPrivileges=true" in content
+
+    # Check timer file content
+    content = (SYSTEMD_DIR / "sysd-file-test.timer").read_text()
+    assert "[Unit]" in content
+    assert "Description=Timer for File Test Service" in content
+    assert "[Timer]" in content
+    assert "OnCalendar=hourly" in content
+    assert "Requires=sysd-file-test.service" in content
+    assert "[Install]" in content
+    assert "WantedBy=timers.target" in content
+
+    manager.remove("file-test")
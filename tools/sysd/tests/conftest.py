@@ -0,0 +1,202 @@
+"""Shared fixtures for the sysd integration tests."""
+
+import os
+import re
+import time
+from pathlib import Path
+
+import pytest
+
+# Leave the shared container running after the session so the next run can
+# exec straight into it instead of booting a new one
+KEEP_CONTAINER = bool(os.environ.get("SYSD_TEST_KEEP_CONTAINER"))
+
+# A prebuilt test image to use as-is, e.g. one CI built with a layer cache
+PREBUILT_IMAGE = os.environ.get("SYSD_TEST_IMAGE")
+
+
+def _docker_available() -> bool:
+    """Check whether a Docker daemon is reachable."""
+    try:
+        import docker
+
+        docker.from_env().ping()
+    except Exception:
+        return False
+    return True
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests up front when Docker isn't available."""
+    integration = [item for item in items if item.get_closest_marker("integration")]
+    if not integration or _docker_available():
+        return
+
+    skip = pytest.mark.skip(reason="Docker is not available")
+    for item in integration:
+        item.add_marker(skip)
+
+
+def _wait_for_systemd(container, timeout: float = 15) -> None:
+    """Wait for systemd in the container to finish booting."""
+    deadline = time.monotonic() + timeout
+    state = b""
+    while time.monotonic() < deadline:
+        result = container.exec_run("systemctl is-system-running --wait", user="root")
+        state = result.output.strip()
+        if state in (b"running", b"degraded"):
+            return
+        time.sleep(0.2)
+    pytest.fail(
+        f"systemd in the test container was not ready after {timeout}s "
+        f"(is-system-running: {state.decode(errors='replace')!r})"
+    )
+
+
+def _reset_sysd(container) -> None:
+    """Remove all sysd units and config from the container."""
+    container.exec_run(
+        'bash -c \'systemctl stop "sysd-*.timer" "sysd-*.service"; '
+        "rm -f /etc/systemd/system/sysd-*.service /etc/systemd/system/sysd-*.timer "
+        "/home/testuser/.config/sysd/services.json; "
+        "systemctl daemon-reload'",
+        user="root",
+    )
+
+
+class ContainerShell:
+    """A persistent bash session inside a container, driven over one exec socket.
+
+    Each command is a write to the shell's stdin rather than a new exec, so it
+    costs no extra round-trips to the Docker API.
+    """
+
+    _RC_RE = re.compile(rb"__RC__(\d+)__\n\Z")
+
+    def __init__(
+        self,
+        container,
+        user: str = "root",
+        workdir: str | None = None,
+        environment: dict[str, str] | None = None,
+    ):
+        api = container.client.api
+        exec_id = api.exec_create(
+            container.id,
+            "/bin/bash",
+            stdin=True,
+            user=user,
+            workdir=workdir,
+            environment=environment,
+        )
+        self._socket = api.exec_start(exec_id, socket=True)
+
+    def run(self, cmd: str) -> tuple[int, str]:
+        """Run a shell command, returning its exit code and combined output."""
+        from docker.utils.socket import next_frame_header, read_exactly
+
+        # Keep the command off the shell's stdin so it can't swallow later ones
+        line = f"{{ {cmd}\n}} 2>&1 </dev/null; echo __RC__$?__\n"
+        getattr(self._socket, "_sock", self._socket).sendall(line.encode())
+
+        # Output arrives in multiplexed frames: an 8-byte header, then payload
+        output = b""
+        while not (match := self._RC_RE.search(output)):
+            _, size = next_frame_header(self._socket)
+            if size < 0:
+                raise RuntimeError(f"Container shell exited while running {cmd!r}")
+            output += read_exactly(self._socket, size)
+        return int(match.group(1)), output[: match.start()].decode()
+
+    def close(self) -> None:
+        """Close the exec socket, ending the shell."""
+        self._socket.close()
+
+
+@pytest.fixture(scope="session")
+def docker_client():
+    """Get Docker client."""
+    import docker
+
+    return docker.from_env()
+
+
+@pytest.fixture(scope="session")
+def sysd_image(docker_client):
+    """Build sysd test image, reusing layers from the previous build."""
+    if PREBUILT_IMAGE:
+        return docker_client.images.get(PREBUILT_IMAGE)
+
+    # Build straight from the source tree so Docker's layer cache survives
+    # between runs; the image is kept afterwards for the next session.
+    sysd_path = Path(__file__).parent.parent
+    image, _ = docker_client.images.build(
+        path=str(sysd_path),
+        dockerfile="Dockerfile.test",
+        tag="sysd-test:latest",
+        cache_from=["sysd-test:latest"],
+        rm=True,
+    )
+    return image
+
+
+@pytest.fixture(scope="session")
+def sysd_container(docker_client, sysd_image):
+    """Get the long-lived sysd container, starting it if it isn't running."""
+    import docker
+
+    # One shared container per xdist worker, found again by name
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    name = f"sysd-test-shared-{worker}"
+
+    try:
+        container = docker_client.containers.get(name)
+    except docker.errors.NotFound:
+        container = None
+
+    # A container left over from an older image would test stale code
+    if container is not None and container.image.id != sysd_image.id:
+        container.remove(force=True)
+        container = None
+
+    if container is None:
+        container = docker_client.containers.run(
+            sysd_image.id, detach=True, privileged=True, name=name
+        )
+        _wait_for_systemd(container)
+    else:
+        if container.status != "running":
+            container.start()
+            _wait_for_systemd(container)
+        _reset_sysd(container)
+
+    yield container
+
+    if not KEEP_CONTAINER:
+        try:
+            container.stop()
+            container.remove()
+        except Exception:
+            pass
+
+
+@pytest.fixture
+def clean_sysd(sysd_container):
+    """Remove any sysd units and config a test leaves behind in the container."""
+    yield sysd_container
+    _reset_sysd(sysd_container)
+
+
+@pytest.fixture(scope="session")
+def run_in(sysd_container):
+    """Run shell commands as testuser in the sysd checkout, in one persistent shell."""
+    # Exec as testuser directly rather than through `su -`, which would
+    # rerun the login profile for every command
+    shell = ContainerShell(
+        sysd_container,
+        user="testuser",
+        workdir="/home/testuser/sysd",
+        environment={"HOME": "/home/testuser"},
+    )
+    yield shell.run
+    shell.close()
@@ -1,68 +1,106 @@
 """Unit tests for sysd functionality."""
 
+import os
+import subprocess
 import tempfile
-from pathlib import Path
-from unittest.mock import Mock, patch
 
 import pytest
 
-from sysd.manager import SystemdManager
+from sysd.manager import SystemdManager, _is_uv_project
 
 
 class TestSystemdManager:
     """Test the SystemdManager class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.manager = SystemdManager()
-        # Mock the systemd directory for testing
-        self.manager.systemd_dir = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
-
-    def test_schedule_parsing(self):
-        """Test schedule parsing functionality."""
-        test_cases = [
+    @pytest.fixture(autouse=True)
+    def manager(self, tmp_path, monkeypatch):
+        """Set up a manager that writes units and config under tmp_path."""
+        self.tmp_path = tmp_path
+        # Jinja's bytecode cache lives in the temp dir; keep it under tmp_path
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        self.systemctl_calls = []
+        _is_uv_project.cache_clear()
+
+        def record_systemctl(argv):
+            self.systemctl_calls.append(argv[2:])
+            return subprocess.CompletedProcess(argv, 0, "", "")
+
+        self.manager = SystemdManager(
+            systemd_dir=tmp_path, systemctl_runner=record_systemctl
+        )
+        # Keep the config directory under tmp_path as well
+        self.manager.config_dir = tmp_path / "config"
+        self.manager.config_dir.mkdir()
+        self.manager.services_file = self.manager.config_dir / "services.json"
+
+        yield self.manager
+
+        self.manager.close()
+
+    @pytest.mark.parametrize(
+        "input_schedule,expected",
+        [
             ("*/15", ("calendar", "*:0/15")),
             ("hourly", ("calendar", "hourly")),
             ("daily", ("calendar", "daily")),
             ("@startup", ("startup", "1min")),
             ("@boot", ("boot", "1min")),
             ("Mon *-*-* 10:00:00", ("calendar", "mon *-*-* 10:00:00")),
-        ]
-
-        for input_schedule, expected in test_cases:
-            result = self.manager._parse_schedule(input_schedule)
-            assert result == expected, (
-                f"Failed for {input_schedule}: got {result}, expected {expected}"
-            )
-
-    def test_command_building(self):
+        ],
+    )
+    def test_schedule_parsing(self, input_schedule, expected):
+        """Test schedule parsing functionality."""
+        assert self.manager._parse_schedule(input_schedule) == expected
+
+    @pytest.mark.parametrize(
+        "uv_path,command,expected",
+        [
+            (
+                "/usr/local/bin/uv",
+                "python -m mymodule",
+                "/usr/local/bin/uv run python -m mymodule",
+            ),
+            ("/usr/local/bin/uv", "echo hello", "/usr/local/bin/uv run echo hello"),
+            # Only argv[0] is inspected, and arguments keep their grouping
+            (
+                "/usr/local/bin/uv",
+                'bash -c "python foo"',
+                "/usr/local/bin/uv run bash -c 'python foo'",
+            ),
+            ("/usr/local/bin/uv", "uv run app.py", "/usr/local/bin/uv run app.py"),
+            # Commands with unbalanced quotes are only prefixed, not re-quoted
+            (
+                "/usr/local/bin/uv",
+                "echo \"it's",
+                "/usr/local/bin/uv run echo \"it's",
+            ),
+            ("/usr/local/bin/uv", "uv run 'x", "/usr/local/bin/uv run 'x"),
+            (None, "echo 'x", "echo 'x"),
+            (None, "python -m mymodule", "python -m mymodule"),
+        ],
+    )
+    def test_command_building(self, monkeypatch, uv_path, command, expected):
         """Test command building for uv projects."""
-        working_dir = "/test/project"
-
-        # Test with Python command in uv project
-        with patch("pathlib.Path.exists", return_value=True):  # pyproject.toml exists
-            with patch("shutil.which", return_value="/usr/local/bin/uv"):
-                result = self.manager._build_command("python -m mymodule", working_dir)
-                assert result == "/usr/local/bin/uv run python -m mymodule"
-
-        # Test with non-Python command
-        with patch("pathlib.Path.exists", return_value=True):
-            with patch("shutil.which", return_value="/usr/local/bin/uv"):
-                result = self.manager._build_command("echo hello", working_dir)
-                assert result == "/usr/local/bin/uv run echo hello"
-
-        # Test without uv available
-        with patch("pathlib.Path.exists", return_value=True):
-            with patch("shutil.which", return_value=None):
-                result = self.manager._build_command("python -m mymodule", working_dir)
-                assert result == "python -m mymodule"
+        monkeypatch.setattr("pathlib.Path.exists", lambda self: True)
+        monkeypatch.setattr("shutil.which", lambda name: uv_path)
+        assert self.manager._build_command(command, "/test/project") == expected
+
+    def test_uv_detection_is_cached(self, monkeypatch):
+        """Test that the uv lookup and project detection are not repeated."""
+        exists_calls, which_calls = [], []
+        monkeypatch.setattr(
+            "pathlib.Path.exists", lambda path: exists_calls.append(path) or True
+        )
+        monkeypatch.setattr(
+            "shutil.which", lambda name: which_calls.append(name) or "/usr/local/bin/uv"
+        )
+
+        for _ in range(3):
+            result = self.manager._build_command("python app.py", "/test/project")
+            assert result == "/usr/local/bin/uv run python app.py"
+
+        assert len(which_calls) == 1
+        assert len(exists_calls) == 1
 
     def test_template_rendering(self):
         """Test service and timer template rendering."""
@@ -114,25 +152,142 @@ class TestSystemdManager:
         assert "[Install]" in result
         assert "WantedBy=timers.target" in result
 
-    @patch("subprocess.run")
-    def test_add_service_dry_run(self, mock_subprocess):
-        """Test service addition without actually running systemctl commands."""
-        # Mock successful subprocess calls
-        mock_subprocess.return_value = Mock(returncode=0)
-
-        with patch.object(self.manager, "_run_systemctl"):
-            # This should create temp files and attempt to copy them
-            # We'll catch the exception when it tries to copy to the mocked systemd_dir
-            try:
-                self.manager.add(
-                    name="test-service",
-                    command="echo hello",
-                    schedule="*/15",
-                    description="Test Service",
-                )
-            except Exception:
-                # Expected to fail when trying to copy files, but templates should be generated
-                pass
+        # A second manager loads the compiled templates from the bytecode cache
+        other = SystemdManager(systemd_dir=self.tmp_path)
+        other_template = other.jinja_env.get_template("timer.j2")
+        assert other.jinja_env.bytecode_cache is not None
+        assert other_template.render(**timer_context) == result
+        assert list(self.tmp_path.glob("_jinja2-cache-*/*.cache"))
+        other.close()
+
+    def test_add_service(self):
+        """Test that adding a service writes its units and enables the timer."""
+        self.manager.add(
+            name="test-service",
+            command="echo hello",
+            schedule="*/15",
+            working_dir=str(self.tmp_path),
+            description="Test Service",
+        )
+
+        service = (self.tmp_path / "sysd-test-service.service").read_text()
+        assert "ExecStart=echo hello" in service
+        assert f"WorkingDirectory={self.tmp_path}" in service
+        timer = (self.tmp_path / "sysd-test-service.timer").read_text()
+        assert "OnCalendar=*:0/15" in timer
+
+        assert self.systemctl_calls == [
+            ["daemon-reload"],
+            ["enable", "--now", "sysd-test-service.timer"],
+        ]
+        assert self.manager._load_services()["test-service"]["schedule"] == "*/15"
+
+        # Removing it stops the units and deletes the files again
+        self.systemctl_calls.clear()
+        self.manager.remove("test-service")
+        assert list(self.tmp_path.glob("sysd-*")) == []
+        assert self.systemctl_calls == [
+            ["stop", "sysd-test-service.timer"],
+            ["disable", "sysd-test-service.timer"],
+            ["stop", "sysd-test-service.service"],
+            ["daemon-reload"],
+        ]
+        assert self.manager._load_services() == {}
+
+    def test_templates_loaded_once(self, monkeypatch):
+        """Test that repeated adds reuse the compiled templates."""
+        loaded = []
+        get_template = self.manager.jinja_env.get_template
+        monkeypatch.setattr(
+            self.manager.jinja_env,
+            "get_template",
+            lambda name: loaded.append(name) or get_template(name),
+        )
+
+        self.manager.add(name="one", command="echo one")
+        self.manager.add(name="two", command="echo two")
+
+        assert loaded == ["service.j2", "timer.j2"]
+
+    def test_batch_defers_reload_and_enable(self):
+        """Test that adds inside batch() share one reload and one enable."""
+        with self.manager.batch():
+            self.manager.add(name="one", command="echo one")
+            self.manager.add(name="two", command="echo two")
+            assert self.systemctl_calls == []
+
+        assert self.systemctl_calls == [
+            ["daemon-reload"],
+            ["enable", "--now", "sysd-one.timer", "sysd-two.timer"],
+        ]
+
+    def test_update_in_place(self, monkeypatch):
+        """Test that update rewrites only the unit files a change touches."""
+        self.manager._save_services(
+            {
+                "test": {
+                    "command": "echo hello",
+                    "schedule": "*/15",
+                    "description": "Test Service",
+                    "working_dir": "/test/dir",
+                    "environment": {},
+                    "data_dirs": [],
+                    "service_name": "sysd-test",
+                    "timer_name": "sysd-test.timer",
+                }
+            }
+        )
+        service_file = self.tmp_path / "sysd-test.service"
+        timer_file = self.tmp_path / "sysd-test.timer"
+
+        # A schedule change only touches the timer
+        self.manager.update("test", schedule="hourly")
+        assert "OnCalendar=hourly" in timer_file.read_text()
+        assert not service_file.exists()
+        assert self.systemctl_calls == [
+            ["daemon-reload"],
+            ["restart", "sysd-test.timer"],
+        ]
+        assert self.manager._load_services()["test"]["schedule"] == "hourly"
+
+        timer_file.unlink()
+        self.systemctl_calls.clear()
+
+        # A command change only touches the service
+        self.manager.update("test", command="echo bye")
+        assert "ExecStart=echo bye" in service_file.read_text()
+        assert not timer_file.exists()
+        assert self.systemctl_calls == [["daemon-reload"]]
+
+        service_file.unlink()
+        self.systemctl_calls.clear()
+
+        # Updating to the stored values touches nothing
+        monkeypatch.setattr(
+            self.manager, "_save_services", lambda services: pytest.fail("saved")
+        )
+        self.manager.update("test", command="echo bye", environment={})
+
+        assert not service_file.exists()
+        assert self.systemctl_calls == []
+
+    def test_logs_unit_matches(self, monkeypatch):
+        """Test that logs match units instead of listing every identifier."""
+        self.manager._save_services(
+            {name: {"service_name": f"sysd-{name}"} for name in ("one", "two", "three")}
+        )
+        commands = []
+        monkeypatch.setattr(
+            "subprocess.run", lambda cmd, **kwargs: commands.append(cmd)
+        )
+
+        self.manager.logs(all_services=True)
+        self.manager.logs("two", follow=True, lines=10)
+
+        assert commands == [
+            ["journalctl", "-u", "sysd-*.service", "--lines=50"],
+            ["journalctl", "-u", "sysd-two.service", "--lines=10", "--follow"],
+        ]
 
     def test_service_name_validation(self):
         """Test service name validation."""
@@ -143,18 +298,25 @@ class TestSystemdManager:
             self.manager._validate_service_name(name)
 
         # Invalid names (if validation exists)
-        invalid_names = ["", "test service", "test/service"]
+        invalid_names = ["", "test service", "test/service", "test:service", "a\\b"]
         for name in invalid_names:
             with pytest.raises(ValueError):
                 self.manager._validate_service_name(name)
 
+    def test_parse_env(self):
+        """Test parsing environment variables from the CLI."""
+        assert SystemdManager._parse_env("") is None
+        assert SystemdManager._parse_env('{"A": "1", "B": "x=y"}') == {
+            "A": "1",
+            "B": "x=y",
+        }
+        assert SystemdManager._parse_env(" A = 1 ,B=x=y,junk") == {
+            "A": "1",
+            "B": "x=y",
+        }
+
     def test_config_persistence(self):
         """Test configuration saving and loading."""
-        # Mock config directory
-        config_dir = Path(self.temp_dir) / "config"
-        config_dir.mkdir()
-        self.manager.config_file = config_dir / "services.json"
-
         # Test saving configuration
         test_services = {
             "test-service": {
@@ -171,6 +333,171 @@ class TestSystemdManager:
         loaded_services = self.manager._load_services()
         assert loaded_services == test_services
 
+        # Saves replace the file whole, leaving no temporary file behind
+        assert list(self.manager.config_dir.iterdir()) == [self.manager.services_file]
+
+        # A corrupt file loads as empty
+        self.manager.services_file.write_text("{not json")
+        assert self.manager._load_services() == {}
+
+    def test_list_services_batches_status_queries(self, monkeypatch, capsys):
+        """Test that listing services queries all units in two systemctl calls."""
+        self.manager._save_services(
+            {
+                name: {
+                    "schedule": "*/15",
+                    "description": f"{name} service",
+                    "service_name": f"sysd-{name}",
+                    "timer_name": f"sysd-{name}.timer",
+                }
+                for name in ("one", "two", "three")
+            }
+        )
+        states = {
+            "is-active": "active\ninactive\nactive\n",
+            "is-failed": "active\ninactive\nfailed\n",
+        }
+
+        def fake_systemctl(argv):
+            self.systemctl_calls.append(argv[2:])
+            return subprocess.CompletedProcess(argv, 0, states[argv[2]], "")
+
+        monkeypatch.setattr(self.manager, "_systemctl_runner", fake_systemctl)
+        self.manager.list_services()
+
+        assert self.systemctl_calls == [
+            ["is-active", "sysd-one.timer", "sysd-two.timer", "sysd-three.timer"],
+            [
+                "is-failed",
+                "sysd-one.service",
+                "sysd-two.service",
+                "sysd-three.service",
+            ],
+        ]
+
+        lines = capsys.readouterr().out.splitlines()[2:]
+        assert [line[0] for line in lines] == ["✓", "○", "✗"]
+
+    def test_run_systemctl_reuses_shell(self, monkeypatch):
+        """Test that systemctl commands share one persistent shell."""
+        manager = SystemdManager(systemd_dir=self.tmp_path)
+
+        # Stand in for systemctl with a script that echoes its arguments
+        fake_systemctl = self.tmp_path / "systemctl"
+        fake_systemctl.write_text(
+            '#!/bin/sh\necho "$@"\necho warning >&2\n[ "$1" = is-active ]\n'
+        )
+        fake_systemctl.chmod(0o755)
+        env = {**os.environ, "PATH": f"{self.tmp_path}:{os.environ['PATH']}"}
+
+        shells = []
+        popen = subprocess.Popen
+
+        def fake_popen(argv, **kwargs):
+            shells.append(argv)
+            return popen(["sh"], env=env, **kwargs)
+
+        monkeypatch.setattr("subprocess.Popen", fake_popen)
+
+        result = manager._run_systemctl(["is-active", "a b.timer"])
+        assert result.returncode == 0
+        assert result.stdout == "is-active a b.timer\n"
+        assert result.stderr == "warning\n"
+
+        result = manager._run_systemctl(["is-failed", "x"], check=False)
+        assert result.returncode == 1
+        assert result.stdout == "is-failed x\n"
+
+        with pytest.raises(subprocess.CalledProcessError):
+            manager._run_systemctl(["is-failed", "x"])
+
+        assert shells == [["sudo", "sh"]]
+
+        manager.close()
+        assert manager._sudo_shell is None
+
+    def test_run_systemctl_large_stderr(self, monkeypatch):
+        """Test that output larger than a pipe buffer doesn't block the shell."""
+        manager = SystemdManager(systemd_dir=self.tmp_path)
+
+        # Write well past the 64 KiB pipe buffer on both streams
+        fake_systemctl = self.tmp_path / "systemctl"
+        fake_systemctl.write_text(
+            "#!/bin/sh\n"
+            "head -c 200000 /dev/zero | tr '\\0' e >&2\n"
+            "head -c 100000 /dev/zero | tr '\\0' o\n"
+            "exit 3\n"
+        )
+        fake_systemctl.chmod(0o755)
+        env = {**os.environ, "PATH": f"{self.tmp_path}:{os.environ['PATH']}"}
+
+        popen = subprocess.Popen
+        monkeypatch.setattr(
+            "subprocess.Popen",
+            lambda argv, **kwargs: popen(["sh"], env=env, **kwargs),
+        )
+
+        result = manager._run_systemctl(["status", "x"], check=False)
+        assert result.returncode == 3
+        assert result.stdout == "o" * 100000
+        assert result.stderr == "e" * 200000
+
+        # The shell is still usable afterwards
+        result = manager._run_systemctl(["status", "x"], check=False)
+        assert len(result.stderr) == 200000
+
+        manager.close()
+
+    def test_sudo_shell_failure(self, monkeypatch):
+        """Test that a sudo shell that dies is reported as a failed command."""
+        manager = SystemdManager(systemd_dir=self.tmp_path)
+
+        popen = subprocess.Popen
+        monkeypatch.setattr(
+            "subprocess.Popen",
+            lambda argv, **kwargs: popen(
+                ["sh", "-c", "echo 'sudo: a password is required' >&2; exit 1"],
+                **kwargs,
+            ),
+        )
+
+        result = manager._run_systemctl(["status", "x"], check=False)
+        assert result.returncode == 1
+        assert "a password is required" in result.stderr
+
+        with pytest.raises(subprocess.CalledProcessError):
+            manager._run_systemctl(["daemon-reload"])
+
+        manager.close()
+
+    def test_unit_files_use_sudo_shell(self, monkeypatch):
+        """Test that unit files outside our permissions go through the sudo shell."""
+        manager = SystemdManager(systemd_dir=self.tmp_path)
+
+        shells = []
+        popen = subprocess.Popen
+
+        def fake_popen(argv, **kwargs):
+            shells.append(argv)
+            return popen(["sh"], **kwargs)
+
+        monkeypatch.setattr("subprocess.Popen", fake_popen)
+        monkeypatch.setattr("os.access", lambda path, mode: False)
+        monkeypatch.setattr(
+            "subprocess.run", lambda *args, **kwargs: pytest.fail("ran sudo")
+        )
+
+        unit_file = self.tmp_path / "sysd-test.service"
+        content = "[Service]\nExecStart=echo 'it'\"s' $HOME\n"
+        manager._write_unit_file(unit_file, content)
+        assert unit_file.read_text() == content
+
+        manager._remove_unit_file(unit_file)
+        assert not unit_file.exists()
+
+        assert shells == [["sudo", "sh"]]
+        manager.close()
+
 
 class TestCLIFunctions:
     """Test CLI-related functionality."""